@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+"""
+Compile Prompty Response Schemas into Precompiled Validators
+
+Extracts every inline `model.parameters.response_format.json_schema.schema`
+from prompts/**/*.prompty, plus every `$schema` file referenced by a prompty
+frontmatter, and code-generates one plain-Python validator function per
+schema (fastjsonschema style: no schema walking at validation time).
+
+Output: prompts/_compiled/response_validators.py (git-ignored build cache)
+
+Usage:
+    # Build (skipped when no schema changed since the last build)
+    python scripts/compile_response_validators.py
+
+    # Force a rebuild
+    python scripts/compile_response_validators.py --force
+
+    # Throughput benchmark on a large classified_facts array
+    python scripts/compile_response_validators.py --benchmark --facts 20000
+
+Consumers:
+    validators = load_validators()
+    validators.RESPONSE_VALIDATORS["researchers/fact_classifier"](payload)
+
+Supported keywords: type, properties, required, additionalProperties, items,
+enum, const, minimum, maximum, exclusiveMinimum, exclusiveMaximum, minItems,
+maxItems, minLength, maxLength. Schemas using anything else ($ref, anyOf, ...)
+are reported and left to the generic validator.
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import inspect
+import json
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+from instrumentation import add_trace_arguments, configure_tracing, tracer
+from prompt_files import PROMPTS_DIR, extract_frontmatter, has_archived_parent
+
+DEFAULT_OUTPUT = PROMPTS_DIR / "_compiled" / "response_validators.py"
+
+BENCHMARK_PROMPT_ID = "researchers/fact_classifier"
+
+# Keywords that carry no validation semantics
+ANNOTATION_KEYWORDS = {"$schema", "$id", "title", "description", "default", "examples"}
+
+SUPPORTED_KEYWORDS = ANNOTATION_KEYWORDS | {
+    "type",
+    "properties",
+    "required",
+    "additionalProperties",
+    "items",
+    "enum",
+    "const",
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "minItems",
+    "maxItems",
+    "minLength",
+    "maxLength",
+}
+
+# JSON type name → Python isinstance check on `{v}`
+TYPE_CHECKS = {
+    "string": "isinstance({v}, str)",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": (
+        "((isinstance({v}, int) and not isinstance({v}, bool))"
+        " or (isinstance({v}, float) and {v}.is_integer()))"
+    ),
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "array": "isinstance({v}, list)",
+    "object": "isinstance({v}, dict)",
+}
+
+MODULE_HEADER = '''"""
+Precompiled response validators - GENERATED, DO NOT EDIT.
+
+Regenerate with: python scripts/compile_response_validators.py
+"""
+
+BUILD_HASH = {build_hash!r}
+
+
+class JsonSchemaValueException(ValueError):
+    """Raised when a payload does not match its compiled schema."""
+
+    def __init__(self, message, path):
+        super().__init__(f"{{path}}: {{message}}")
+        self.message = message
+        self.path = path
+'''
+
+
+class UnsupportedSchemaError(ValueError):
+    """Raised when a schema uses a keyword the code generator cannot compile."""
+
+
+def json_equal(a, b) -> bool:
+    """JSON Schema equality for enum/const: unlike ==, booleans never equal numbers."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(map(json_equal, a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(json_equal(v, b[k]) for k, v in a.items())
+    return a == b
+
+
+def _needs_json_equal(values: list) -> bool:
+    # Plain ==/in is exact when every allowed value is a string or null
+    return not all(value is None or isinstance(value, str) for value in values)
+
+
+# ===================================================================
+# SCHEMA DISCOVERY
+# ===================================================================
+
+
+def prompt_id(prompty_file: Path, frontmatter: dict) -> str:
+    """Key a prompt by its frontmatter `id`, else its path under prompts/."""
+    if frontmatter.get("id"):
+        return str(frontmatter["id"])
+    return prompty_file.relative_to(PROMPTS_DIR).with_suffix("").as_posix()
+
+
+def _response_schema(frontmatter: dict) -> dict | None:
+    model = frontmatter.get("model") or {}
+    parameters = model.get("parameters") or {}
+    response_format = parameters.get("response_format") or {}
+    if response_format.get("type") != "json_schema":
+        return None
+    return (response_format.get("json_schema") or {}).get("schema")
+
+
+def collect_schemas(
+    prompts_dir: Path = PROMPTS_DIR,
+) -> tuple[dict[str, dict], dict[str, dict]]:
+    """
+    Collect response schemas and `$schema` files from all active prompts.
+
+    Returns:
+        (response_schemas keyed by prompt id,
+         frontmatter schemas keyed by path relative to prompts/)
+    """
+    response_schemas: dict[str, dict] = {}
+    frontmatter_schemas: dict[str, dict] = {}
+
+    for prompty_file in sorted(prompts_dir.rglob("*.prompty")):
+        relative = prompty_file.relative_to(prompts_dir)
+        if prompty_file.name.startswith("_") or has_archived_parent(relative):
+            continue
+
+        frontmatter = extract_frontmatter(prompty_file.read_text(encoding="utf-8"))
+        if not frontmatter:
+            continue
+
+        schema = _response_schema(frontmatter)
+        if schema:
+            key = prompt_id(prompty_file, frontmatter)
+            if key in response_schemas:
+                raise ValueError(f"Duplicate prompt id '{key}' ({relative})")
+            response_schemas[key] = schema
+
+        schema_ref = frontmatter.get("$schema")
+        if schema_ref:
+            schema_path = (prompty_file.parent / schema_ref).resolve()
+            key = schema_path.relative_to(prompts_dir.resolve()).as_posix()
+            if key not in frontmatter_schemas:
+                with open(schema_path) as f:
+                    frontmatter_schemas[key] = yaml.safe_load(f)
+
+    return response_schemas, frontmatter_schemas
+
+
+def build_hash(*registries: dict[str, dict]) -> str:
+    """Content hash of all schemas - the compiled module is reused while it matches."""
+    # The code generator is part of the key - editing it recompiles
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    for registry in registries:
+        digest.update(json.dumps(registry, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+# ===================================================================
+# CODE GENERATION
+# ===================================================================
+
+
+class ValidatorCodeGenerator:
+    """Generate straight-line Python validators from JSON schemas."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self.constants: list[str] = []
+        self._counter = 0
+
+    def _name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}_{self._counter}"
+
+    def _constant(self, value, wrap: str = "") -> str:
+        name = self._name("_CONST").upper()
+        literal = f"{wrap}({value!r})" if wrap else repr(value)
+        self.constants.append(f"{name} = {literal}")
+        return name
+
+    def _emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def _raise(self, indent: int, message: str, path: str) -> None:
+        self._emit(indent, f"raise JsonSchemaValueException({message!r}, {path})")
+
+    def add_function(self, func_name: str, schema: dict) -> None:
+        self._emit(0, f"def {func_name}(data):")
+        self._generate(schema, "data", '"data"', 1)
+        self._emit(1, "return data")
+        self._emit(0, "")
+        self._emit(0, "")
+
+    def _generate(self, schema, var: str, path: str, indent: int) -> None:
+        if schema is True or schema == {}:
+            return
+        if schema is False:
+            self._raise(indent, "must not be present", path)
+            return
+        if not isinstance(schema, dict):
+            raise UnsupportedSchemaError(f"Schema must be an object, got {schema!r}")
+
+        unsupported = set(schema) - SUPPORTED_KEYWORDS
+        if unsupported:
+            raise UnsupportedSchemaError(
+                f"Unsupported keyword(s): {', '.join(sorted(unsupported))}"
+            )
+
+        if "type" in schema:
+            types = schema["type"]
+            types = [types] if isinstance(types, str) else list(types)
+            checks = " or ".join(TYPE_CHECKS[t].format(v=var) for t in types)
+            self._emit(indent, f"if not ({checks}):")
+            self._raise(indent + 1, f"must be {' or '.join(types)}", path)
+
+        if "enum" in schema:
+            allowed = self._constant(schema["enum"])
+            if _needs_json_equal(schema["enum"]):
+                value = self._name("e")
+                check = f"not any(json_equal({var}, {value}) for {value} in {allowed})"
+            else:
+                check = f"{var} not in {allowed}"
+            self._emit(indent, f"if {check}:")
+            self._raise(indent + 1, f"must be one of {schema['enum']}", path)
+
+        if "const" in schema:
+            const = schema["const"]
+            if _needs_json_equal([const]):
+                check = f"not json_equal({var}, {self._constant(const)})"
+            else:
+                check = f"{var} != {const!r}"
+            self._emit(indent, f"if {check}:")
+            self._raise(indent + 1, f"must be {const!r}", path)
+
+        self._generate_number(schema, var, path, indent)
+        self._generate_string(schema, var, path, indent)
+        self._generate_array(schema, var, path, indent)
+        self._generate_object(schema, var, path, indent)
+
+    def _generate_number(self, schema: dict, var: str, path: str, indent: int) -> None:
+        bounds = [
+            ("minimum", "<", "must be >="),
+            ("maximum", ">", "must be <="),
+            ("exclusiveMinimum", "<=", "must be >"),
+            ("exclusiveMaximum", ">=", "must be <"),
+        ]
+        active = [(k, op, msg) for k, op, msg in bounds if k in schema]
+        if not active:
+            return
+        self._emit(
+            indent,
+            f"if isinstance({var}, (int, float)) and not isinstance({var}, bool):",
+        )
+        for keyword, op, message in active:
+            self._emit(indent + 1, f"if {var} {op} {schema[keyword]!r}:")
+            self._raise(indent + 2, f"{message} {schema[keyword]}", path)
+
+    def _generate_string(self, schema: dict, var: str, path: str, indent: int) -> None:
+        if "minLength" not in schema and "maxLength" not in schema:
+            return
+        self._emit(indent, f"if isinstance({var}, str):")
+        if "minLength" in schema:
+            self._emit(indent + 1, f"if len({var}) < {schema['minLength']}:")
+            self._raise(
+                indent + 2, f"must be at least {schema['minLength']} chars", path
+            )
+        if "maxLength" in schema:
+            self._emit(indent + 1, f"if len({var}) > {schema['maxLength']}:")
+            self._raise(
+                indent + 2, f"must be at most {schema['maxLength']} chars", path
+            )
+
+    def _generate_array(self, schema: dict, var: str, path: str, indent: int) -> None:
+        keys = {"items", "minItems", "maxItems"} & set(schema)
+        if not keys:
+            return
+        if schema.get("type") != "array":
+            self._emit(indent, f"if isinstance({var}, list):")
+            indent += 1
+        if "minItems" in schema:
+            self._emit(indent, f"if len({var}) < {schema['minItems']}:")
+            self._raise(
+                indent + 1, f"must have at least {schema['minItems']} items", path
+            )
+        if "maxItems" in schema:
+            self._emit(indent, f"if len({var}) > {schema['maxItems']}:")
+            self._raise(
+                indent + 1, f"must have at most {schema['maxItems']} items", path
+            )
+        items = schema.get("items")
+        if isinstance(items, dict) and items:
+            index, item = self._name("i"), self._name("item")
+            self._emit(indent, f"for {index}, {item} in enumerate({var}):")
+            item_path = f'{path} + "[" + str({index}) + "]"'
+            self._generate(items, item, item_path, indent + 1)
+
+    def _generate_object(self, schema: dict, var: str, path: str, indent: int) -> None:
+        keys = {"properties", "required", "additionalProperties"} & set(schema)
+        if not keys:
+            return
+        if schema.get("type") != "object":
+            self._emit(indent, f"if isinstance({var}, dict):")
+            indent += 1
+
+        for name in schema.get("required", []):
+            self._emit(indent, f"if {name!r} not in {var}:")
+            self._raise(indent + 1, f"must contain {name!r}", path)
+
+        properties = schema.get("properties") or {}
+        for name, sub_schema in properties.items():
+            if sub_schema is True or sub_schema == {}:
+                continue
+            value = self._name("v")
+            self._emit(indent, f"if {name!r} in {var}:")
+            self._emit(indent + 1, f"{value} = {var}[{name!r}]")
+            self._generate(sub_schema, value, f"{path} + {'.' + name!r}", indent + 1)
+
+        additional = schema.get("additionalProperties", True)
+        if additional is True or additional == {}:
+            return
+        known = self._constant(sorted(properties), wrap="frozenset")
+        key, value = self._name("k"), self._name("v")
+        self._emit(indent, f"for {key}, {value} in {var}.items():")
+        self._emit(indent + 1, f"if {key} not in {known}:")
+        if additional is False:
+            self._raise(indent + 2, "must not contain additional properties", path)
+        else:
+            self._generate(additional, value, f'{path} + "." + str({key})', indent + 2)
+
+    def render(self, header: str) -> str:
+        return "\n".join([header, *self.constants, "", "", *self.lines]).rstrip() + "\n"
+
+
+def _function_name(prefix: str, key: str) -> str:
+    safe = "".join(c if c.isalnum() else "_" for c in key)
+    return f"{prefix}_{safe}".lower()
+
+
+def compile_validators(
+    response_schemas: dict[str, dict], frontmatter_schemas: dict[str, dict]
+) -> tuple[str, list[str]]:
+    """
+    Generate the validator module source.
+
+    Returns:
+        (module source, list of "key: reason" for schemas that were skipped)
+    """
+    generator = ValidatorCodeGenerator()
+    skipped: list[str] = []
+    registries: dict[str, dict[str, str]] = {
+        "RESPONSE_VALIDATORS": {},
+        "FRONTMATTER_VALIDATORS": {},
+    }
+    sources = [
+        ("RESPONSE_VALIDATORS", "validate_response", response_schemas),
+        ("FRONTMATTER_VALIDATORS", "validate_frontmatter", frontmatter_schemas),
+    ]
+
+    for registry, prefix, schemas in sources:
+        for key, schema in schemas.items():
+            func_name = _function_name(prefix, key)
+            checkpoint = (len(generator.lines), len(generator.constants))
+            try:
+                generator.add_function(func_name, schema)
+            except UnsupportedSchemaError as e:
+                del generator.lines[checkpoint[0] :]
+                del generator.constants[checkpoint[1] :]
+                skipped.append(f"{key}: {e}")
+                continue
+            registries[registry][key] = func_name
+
+    for registry, entries in registries.items():
+        generator.lines.append(f"{registry} = {{")
+        for key, func_name in entries.items():
+            generator.lines.append(f"    {key!r}: {func_name},")
+        generator.lines.append("}")
+        generator.lines.append("")
+
+    header = MODULE_HEADER.format(
+        build_hash=build_hash(response_schemas, frontmatter_schemas)
+    )
+    header += "\n\n" + inspect.getsource(json_equal)
+    return generator.render(header), skipped
+
+
+def load_validators(path: Path = DEFAULT_OUTPUT):
+    """Import a compiled validator module from disk."""
+    spec = importlib.util.spec_from_file_location("response_validators", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _cached_build_hash(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.startswith("BUILD_HASH = "):
+            return line.split("=", 1)[1].strip().strip("'\"")
+    return None
+
+
+def build(output: Path = DEFAULT_OUTPUT, force: bool = False) -> Path:
+    """Compile all prompt schemas to `output`, reusing the cache when unchanged."""
+    with tracer.span("collect_schemas"):
+        response_schemas, frontmatter_schemas = collect_schemas()
+    current_hash = build_hash(response_schemas, frontmatter_schemas)
+
+    print(f"📋 {len(response_schemas)} response schemas")
+    print(f"📋 {len(frontmatter_schemas)} $schema files")
+
+    if not force and _cached_build_hash(output) == current_hash:
+        print(f"✅ Up to date: {output} ({current_hash})")
+        return output
+
+    with tracer.span("compile_validators", schemas=len(response_schemas)):
+        source, skipped = compile_validators(response_schemas, frontmatter_schemas)
+    tracer.count(
+        "validators_compiled", len(response_schemas) + len(frontmatter_schemas)
+    )
+    for reason in skipped:
+        print(f"  ⚠️  Skipped {reason}")
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(source, encoding="utf-8")
+    print(f"✅ Compiled to: {output} ({current_hash})")
+    return output
+
+
+# ===================================================================
+# GENERIC VALIDATOR + BENCHMARK
+# ===================================================================
+
+
+def _type_matches(value, type_name: str) -> bool:
+    if type_name in ("number", "integer") and isinstance(value, bool):
+        return False
+    if type_name == "integer":
+        return isinstance(value, int) or (
+            isinstance(value, float) and value.is_integer()
+        )
+    python_types = {
+        "string": str,
+        "number": (int, float),
+        "boolean": bool,
+        "null": type(None),
+        "array": list,
+        "object": dict,
+    }
+    return isinstance(value, python_types[type_name])
+
+
+def validate_generic(schema, data, path: str = "data"):
+    """
+    Interpreted validator for the same keyword subset.
+
+    Walks the schema on every call; used as the benchmark baseline when the
+    `jsonschema` package is not installed, and as a reference in tests.
+    """
+    if schema is True or schema == {}:
+        return data
+    if schema is False:
+        raise ValueError(f"{path}: must not be present")
+
+    if "type" in schema:
+        types = schema["type"]
+        types = [types] if isinstance(types, str) else types
+        if not any(_type_matches(data, t) for t in types):
+            raise ValueError(f"{path}: must be {' or '.join(types)}")
+    if "enum" in schema and not any(json_equal(data, e) for e in schema["enum"]):
+        raise ValueError(f"{path}: must be one of {schema['enum']}")
+    if "const" in schema and not json_equal(data, schema["const"]):
+        raise ValueError(f"{path}: must be {schema['const']!r}")
+
+    if isinstance(data, (int, float)) and not isinstance(data, bool):
+        if "minimum" in schema and data < schema["minimum"]:
+            raise ValueError(f"{path}: must be >= {schema['minimum']}")
+        if "maximum" in schema and data > schema["maximum"]:
+            raise ValueError(f"{path}: must be <= {schema['maximum']}")
+        if "exclusiveMinimum" in schema and data <= schema["exclusiveMinimum"]:
+            raise ValueError(f"{path}: must be > {schema['exclusiveMinimum']}")
+        if "exclusiveMaximum" in schema and data >= schema["exclusiveMaximum"]:
+            raise ValueError(f"{path}: must be < {schema['exclusiveMaximum']}")
+
+    if isinstance(data, str):
+        if "minLength" in schema and len(data) < schema["minLength"]:
+            raise ValueError(f"{path}: must be at least {schema['minLength']} chars")
+        if "maxLength" in schema and len(data) > schema["maxLength"]:
+            raise ValueError(f"{path}: must be at most {schema['maxLength']} chars")
+
+    if isinstance(data, list):
+        if "minItems" in schema and len(data) < schema["minItems"]:
+            raise ValueError(f"{path}: must have at least {schema['minItems']} items")
+        if "maxItems" in schema and len(data) > schema["maxItems"]:
+            raise ValueError(f"{path}: must have at most {schema['maxItems']} items")
+        if isinstance(schema.get("items"), dict):
+            for i, item in enumerate(data):
+                validate_generic(schema["items"], item, f"{path}[{i}]")
+
+    if isinstance(data, dict):
+        for name in schema.get("required", []):
+            if name not in data:
+                raise ValueError(f"{path}: must contain {name!r}")
+        properties = schema.get("properties") or {}
+        additional = schema.get("additionalProperties", True)
+        for key, value in data.items():
+            if key in properties:
+                validate_generic(properties[key], value, f"{path}.{key}")
+            elif additional is False:
+                raise ValueError(f"{path}: must not contain additional properties")
+            elif isinstance(additional, dict):
+                validate_generic(additional, value, f"{path}.{key}")
+
+    return data
+
+
+def _generic_validator(schema: dict):
+    """Prefer the real `jsonschema` package as the baseline when installed."""
+    try:
+        import jsonschema
+    except ImportError:
+        return "validate_generic (interpreted)", lambda data: validate_generic(
+            schema, data
+        )
+    validator = jsonschema.Draft202012Validator(schema)
+    return f"jsonschema {jsonschema.__version__}", validator.validate
+
+
+def sample_classifier_payload(num_facts: int) -> dict:
+    """Synthetic fact_classifier response with `num_facts` classified facts."""
+    return {
+        "classified_facts": [
+            {
+                "fact": f"Product {i} integrates with 50+ CRM platforms",
+                "entity_name": f"Product {i % 250}",
+                "entity_name_normalized": f"product {i % 250}",
+                "entity_type": "Product",
+                "entity_type_confidence": 0.92,
+                "fact_type": "Capability",
+                "fact_type_confidence": 0.88,
+                "source_url": f"https://example.com/products/{i % 250}",
+                "confidence": 0.9,
+            }
+            for i in range(num_facts)
+        ],
+        "skipped_facts": [{"fact": "Cookie banner text", "reason": "boilerplate"}],
+        "entity_summary": {
+            f"Product {i}": {"entity_type": "Product", "fact_count": 4}
+            for i in range(250)
+        },
+    }
+
+
+def _time(func, payload, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(payload)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(output: Path, num_facts: int, repeats: int) -> None:
+    """Compare compiled vs generic validation throughput on classified_facts."""
+    validators = load_validators(build(output))
+    compiled = validators.RESPONSE_VALIDATORS[BENCHMARK_PROMPT_ID]
+    schema = collect_schemas()[0][BENCHMARK_PROMPT_ID]
+    generic_name, generic = _generic_validator(schema)
+    payload = sample_classifier_payload(num_facts)
+
+    with tracer.span("benchmark", validator="compiled", facts=num_facts):
+        compiled_time = _time(compiled, payload, repeats)
+    with tracer.span("benchmark", validator=generic_name, facts=num_facts):
+        generic_time = _time(generic, payload, repeats)
+
+    print(f"\n⏱️  BENCHMARK: {BENCHMARK_PROMPT_ID} ({num_facts:,} classified_facts)")
+    print("=" * 70)
+    print(f"   {'Validator':<35} {'Best (ms)':>10} {'Facts/sec':>14}")
+    for name, elapsed in [
+        ("compiled", compiled_time),
+        (generic_name, generic_time),
+    ]:
+        rate = num_facts / elapsed if elapsed else float("inf")
+        print(f"   {name:<35} {elapsed * 1000:>10.2f} {rate:>14,.0f}")
+    print(f"\n✅ Speedup: {generic_time / compiled_time:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--force", action="store_true", help="Ignore the cache")
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--facts", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=5)
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    configure_tracing(args)
+    try:
+        print("🔧 COMPILING PROMPTY RESPONSE VALIDATORS")
+        print("=" * 70)
+
+        if args.benchmark:
+            benchmark(args.output, args.facts, args.repeats)
+        else:
+            build(args.output, force=args.force)
+        return 0
+    finally:
+        tracer.finish()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
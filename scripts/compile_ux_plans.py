@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Compile UX Aggregation Plans from ux_configs
+
+Validates every field of every ux_configs/*.yaml against its `schema_id`
+schema (field exists, aggregation supported by the field's dataType) and
+compiles one batched aggregation plan per collection: a single Weaviate
+GraphQL `Aggregate` query computing every field's aggregations server-side.
+
+    count / min / max / sum / avg  →  count / minimum / maximum / sum / mean
+    nunique on text                →  topOccurrences(limit: NUNIQUE_LIMIT)
+    nunique on boolean             →  totalTrue / totalFalse
+
+Aggregate has no distinct count for numbers and dates, and topOccurrences
+only pages up to NUNIQUE_LIMIT values. Those fields fall back to one
+client-side fetch projecting only them - the exception, not the dashboard
+load path.
+
+A dashboard load is then one round-trip per collection instead of one query
+per field per aggregation, with no objects downloaded.
+
+Output: ux_configs/_compiled/aggregation_plans.json (git-ignored build cache)
+
+Usage:
+    python scripts/compile_ux_plans.py
+    python scripts/compile_ux_plans.py --output /tmp/plans.json
+
+Consumers:
+    plan = load_plans()["Research_competitor"]
+    response = weaviate_graphql(plan["query"])             # one round-trip
+    stats = execute_plan(
+        plan, response, fetch=lambda props: fetch(plan["collection"], props)
+    )                                   # {"competitorDomain": {"count": ..}}
+
+Client-side nunique counts distinct elements across all arrays for array
+properties (text[], number[], ...).
+"""
+
+import argparse
+import json
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import yaml
+
+from instrumentation import add_trace_arguments, configure_tracing, tracer
+from schema_index import data_type, load_schemas, property_map
+
+CONFIG_ROOT = Path(__file__).parent.parent
+UX_CONFIGS_DIR = CONFIG_ROOT / "ux_configs"
+DEFAULT_OUTPUT = UX_CONFIGS_DIR / "_compiled" / "aggregation_plans.json"
+
+NUMERIC_TYPES = {"int", "number"}
+ORDERED_TYPES = NUMERIC_TYPES | {"date"}
+
+# UX aggregation → Weaviate Aggregate field (nunique is mapped per dataType)
+WEAVIATE_AGGREGATIONS = {
+    "count": "count",
+    "min": "minimum",
+    "max": "maximum",
+    "sum": "sum",
+    "avg": "mean",
+}
+
+# topOccurrences values requested for text nunique; a full page means there
+# may be more distinct values, so the field falls back to a client-side count
+NUNIQUE_LIMIT = 1000
+
+# Aggregation → dataTypes it is valid for (None = any)
+AGGREGATION_TYPES: dict[str, set[str] | None] = {
+    "count": None,
+    "nunique": None,
+    "min": ORDERED_TYPES,
+    "max": ORDERED_TYPES,
+    "sum": NUMERIC_TYPES,
+    "avg": NUMERIC_TYPES,
+}
+
+
+def validate_ux_config(ux_config: dict, schemas: dict[str, dict]) -> tuple[dict, list]:
+    """
+    Validate a UX config against its schema.
+
+    Returns:
+        (aggregate spec {field: [aggregations]} with invalid entries dropped,
+         list of error strings)
+    """
+    errors: list[str] = []
+    schema_id = ux_config.get("schema_id") or ux_config.get("collection")
+    schema = schemas.get(schema_id)
+    if schema is None:
+        return {}, [f"schema_id '{schema_id}' not found in schemas/"]
+
+    properties = property_map(schema)
+    aggregate: dict[str, list[str]] = {}
+
+    for field in ux_config.get("fields") or []:
+        name = field.get("name")
+        prop = properties.get(name)
+        if prop is None:
+            errors.append(f"{name}: not a property of {schema_id}")
+            continue
+
+        base_type, _ = data_type(prop)
+        valid: list[str] = []
+        for aggregation in field.get("aggregations") or []:
+            if aggregation not in AGGREGATION_TYPES:
+                errors.append(f"{name}: unknown aggregation '{aggregation}'")
+                continue
+            allowed = AGGREGATION_TYPES[aggregation]
+            if allowed is not None and base_type not in allowed:
+                errors.append(
+                    f"{name}: '{aggregation}' not supported for dataType {base_type}"
+                )
+                continue
+            if aggregation not in valid:
+                valid.append(aggregation)
+        aggregate[name] = valid
+
+    return aggregate, errors
+
+
+def _server_selection(base_type: str, aggregations: list[str]) -> list[str]:
+    """Weaviate Aggregate selections computing `aggregations` for one field."""
+    selection: list[str] = []
+    for aggregation in aggregations:
+        if aggregation == "nunique":
+            if base_type == "text":
+                selection.append(
+                    f"topOccurrences(limit: {NUNIQUE_LIMIT}) {{ value occurs }}"
+                )
+            elif base_type == "boolean":
+                selection += ["totalTrue", "totalFalse"]
+            continue
+        selection.append(WEAVIATE_AGGREGATIONS[aggregation])
+    # Dedupe, keeping order (count + nunique on booleans, ...)
+    return list(dict.fromkeys(selection))
+
+
+def build_aggregate_query(collection: str, server_fields: dict[str, list]) -> str:
+    """One GraphQL Aggregate query covering every server-side aggregation."""
+    fields = " ".join(
+        f"{name} {{ {' '.join(selection)} }}"
+        for name, selection in server_fields.items()
+    )
+    return f"{{ Aggregate {{ {collection} {{ meta {{ count }} {fields} }} }} }}"
+
+
+def compile_plan(ux_config: dict, schema: dict, aggregate: dict) -> dict:
+    """Build the batched plan for one collection."""
+    properties = property_map(schema)
+    collection = ux_config.get("collection") or schema.get("collection_name")
+    aggregate = {name: aggs for name, aggs in aggregate.items() if aggs}
+
+    server_fields: dict[str, list[str]] = {}
+    client_nunique: list[str] = []
+    nunique_fallback: list[str] = []
+    for name, aggregations in aggregate.items():
+        base_type, _ = data_type(properties[name])
+        if "nunique" in aggregations:
+            if base_type == "text":
+                nunique_fallback.append(name)
+            elif base_type != "boolean":
+                client_nunique.append(name)
+        selection = _server_selection(base_type, aggregations)
+        if selection:
+            server_fields[name] = selection
+
+    return {
+        "collection": collection,
+        "schema_id": ux_config.get("schema_id"),
+        "weaviate_instance": schema.get("weaviate_instance"),
+        "aggregate": aggregate,
+        "query": build_aggregate_query(collection, server_fields),
+        "server_fields": server_fields,
+        # nunique that Aggregate can't answer: always fetched client-side
+        "client_nunique": client_nunique,
+        # text nunique answered by topOccurrences unless it hits NUNIQUE_LIMIT
+        "nunique_fallback": nunique_fallback,
+        "array_properties": sorted(
+            name for name in aggregate if data_type(properties[name])[1]
+        ),
+    }
+
+
+def compile_plans(
+    ux_dir: Path = UX_CONFIGS_DIR, schemas: dict[str, dict] | None = None
+) -> tuple[dict[str, dict], dict[str, list[str]]]:
+    """
+    Compile plans for all UX configs.
+
+    Returns:
+        (plans keyed by collection, errors keyed by UX config file name)
+    """
+    schemas = schemas if schemas is not None else load_schemas()
+    plans: dict[str, dict] = {}
+    all_errors: dict[str, list[str]] = {}
+
+    for ux_file in sorted(ux_dir.glob("*.yaml")):
+        if ux_file.name.startswith("_"):
+            continue
+        with open(ux_file) as f:
+            ux_config = yaml.safe_load(f) or {}
+        if ux_config.get("type") != "ux_config":
+            continue
+
+        with tracer.span("validate_ux_config", file=ux_file.name):
+            aggregate, errors = validate_ux_config(ux_config, schemas)
+        tracer.count("ux_fields", len(aggregate), file=ux_file.name)
+        if errors:
+            all_errors[ux_file.name] = errors
+        schema = schemas.get(ux_config.get("schema_id") or ux_config.get("collection"))
+        if schema is None:
+            continue
+
+        plan = compile_plan(ux_config, schema, aggregate)
+        plan["source"] = ux_file.name
+        plans[plan["collection"]] = plan
+
+    return plans, all_errors
+
+
+# ===================================================================
+# EXECUTION
+# ===================================================================
+
+
+def _values(value, is_array: bool) -> list:
+    if value is None:
+        return []
+    if is_array:
+        return [v for v in value if v is not None]
+    return [value]
+
+
+def count_unique(plan: dict, objects: list[dict], fields: list[str]) -> dict[str, int]:
+    """Client-side nunique for `fields`, counting array elements individually."""
+    arrays = set(plan.get("array_properties", []))
+    unique: dict[str, set] = {name: set() for name in fields}
+    for obj in objects:
+        for name, values in unique.items():
+            for value in _values(obj.get(name), name in arrays):
+                values.add(
+                    json.dumps(value, sort_keys=True)
+                    if isinstance(value, (dict, list))
+                    else value
+                )
+    return {name: len(values) for name, values in unique.items()}
+
+
+def execute_plan(
+    plan: dict, response: dict, fetch: Callable[[list[str]], list[dict]] | None = None
+) -> dict[str, dict]:
+    """
+    Map the plan's Aggregate response to {field: {aggregation: value}}.
+
+    `response` is the GraphQL result of plan["query"] (with or without the
+    top-level "data" key). nunique values Aggregate can't answer exactly are
+    computed from fetch(properties) - called at most once, projecting only
+    those properties. Without `fetch` they are left as None.
+    """
+    data = response.get("data", response)
+    server = data["Aggregate"][plan["collection"]][0]
+
+    results: dict[str, dict] = {}
+    unresolved = list(plan["client_nunique"])
+    for name, aggregations in plan["aggregate"].items():
+        values = server.get(name) or {}
+        computed: dict = {}
+        for aggregation in aggregations:
+            if aggregation != "nunique":
+                computed[aggregation] = values.get(WEAVIATE_AGGREGATIONS[aggregation])
+            elif "totalTrue" in values:
+                computed["nunique"] = (values["totalTrue"] > 0) + (
+                    values["totalFalse"] > 0
+                )
+            elif "topOccurrences" in values:
+                top = values["topOccurrences"] or []
+                if len(top) < NUNIQUE_LIMIT:
+                    computed["nunique"] = len(top)
+                else:
+                    unresolved.append(name)
+        results[name] = computed
+
+    if unresolved and fetch is not None:
+        for name, count in count_unique(plan, fetch(unresolved), unresolved).items():
+            results[name]["nunique"] = count
+    for name in unresolved:
+        results[name].setdefault("nunique", None)
+    return {
+        name: {aggregation: results[name].get(aggregation) for aggregation in aggs}
+        for name, aggs in plan["aggregate"].items()
+    }
+
+
+def load_plans(path: Path = DEFAULT_OUTPUT) -> dict[str, dict]:
+    """Load compiled plans keyed by collection."""
+    with open(path) as f:
+        return json.load(f)["plans"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    configure_tracing(args)
+    try:
+        print("📊 COMPILING UX AGGREGATION PLANS")
+        print("=" * 70)
+
+        plans, errors = compile_plans()
+
+        for collection, plan in plans.items():
+            requests = sum(len(aggs) for aggs in plan["aggregate"].values())
+            client = f", {len(plan['client_nunique'])} nunique client-side"
+            print(
+                f"  ✓ {collection}: {len(plan['aggregate'])} fields, "
+                f"{requests} aggregations → 1 Aggregate query"
+                f"{client if plan['client_nunique'] else ''}"
+            )
+        for ux_file, file_errors in errors.items():
+            for error in file_errors:
+                print(f"  ✗ {ux_file}: {error}")
+
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"plans": plans}, f, indent=2)
+        print(f"\n✅ Saved to: {args.output}")
+
+        if errors:
+            count = sum(len(e) for e in errors.values())
+            print(
+                f"❌ {count} UX field error(s) - invalid aggregations left out of plans"
+            )
+            return 1
+        return 0
+    finally:
+        tracer.finish()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
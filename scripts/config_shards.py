@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Build Schema-Aware Config Shards by Tenant and Weaviate Instance
+
+Every consumer currently loads the whole config tree. A shard is the slice a
+worker actually needs: it starts from a set of collections and holds the
+transitive closure of the configs they reference, pre-parsed into one JSON
+file. Anything outside the shard is still reachable - ShardLoader reads it
+from the tree on demand.
+
+Shard roots:
+    tenant-<id>      the tenant config + every collection in its `collections`
+                     routing
+    instance-<name>  every schema with `weaviate_instance: <name>` + the
+                     services.yaml entries in that category (e.g. spark_weaviate,
+                     spark_transformers)
+    --tenant X --instance Y
+                     tenant X's collections routed to instance Y
+
+Configs that work on the root collections are pulled in as consumers: a data
+card, tool, UX config, researcher or prompt whose collection references all
+fall inside the shard (page_facts / page_facts_search for a spark worker; a
+card that joins Page_facts to Research_* is left to lazy loading). The
+closure then follows every reference (schema_id, collection, target_collection,
+data_card_id, model_card_id, tenant_group, tools, prompty:<id>, ...).
+
+Output: _compiled/shards/<shard>.json (git-ignored build cache)
+
+Usage:
+    # One shard per tenant and per weaviate instance
+    python scripts/config_shards.py
+
+    # A single shard
+    python scripts/config_shards.py --instance spark
+    python scripts/config_shards.py --tenant prismatic
+    python scripts/config_shards.py --tenant prismatic --instance cloud
+
+Consumers:
+    configs = ShardLoader("_compiled/shards/instance-spark.json")
+    schema = configs.get("schema", "Page_facts")      # from the shard
+    tenant = configs.get("tenant", "prismatic")       # lazily read from the tree
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import yaml
+
+from instrumentation import add_trace_arguments, configure_tracing, tracer
+from prompt_files import PROMPTS_DIR, extract_frontmatter, has_archived_parent
+
+CONFIG_ROOT = Path(__file__).parent.parent
+SERVICES_FILE = CONFIG_ROOT / "services.yaml"
+DEFAULT_OUTPUT_DIR = CONFIG_ROOT / "_compiled" / "shards"
+
+# Config kind → directory of one-config-per-file YAML
+YAML_KINDS = {
+    "schema": "schemas",
+    "data_card": "data_cards",
+    "tool": "tools",
+    "ux_config": "ux_configs",
+    "researcher_ai": "researcher_ai",
+    "llm_model": "llm_models",
+    "tenant": "tenants",
+    "tenant_group": "tenant_groups",
+}
+
+# Config key → kind of config its value(s) name
+REFERENCE_KEYS = {
+    "collection": "schema",
+    "collection_name": "schema",
+    "schema_id": "schema",
+    "collection_schema_id": "schema",
+    "target_collection": "schema",
+    "source_collection": "schema",
+    "entity_collection": "schema",
+    "data_card_id": "data_card",
+    "model_card_id": "llm_model",
+    "default_researcher_model": "llm_model",
+    "current_researcher_model": "llm_model",
+    "tenant_group": "tenant_group",
+    "classifier_tenant": "tenant",
+    "tool": "tool",
+    "tools": "tool",
+    "search_tool": "tool",
+}
+
+# Kinds pulled into a shard when all their collection references are inside it
+CONSUMER_KINDS = {"data_card", "tool", "ux_config", "researcher_ai", "prompt"}
+
+
+def node_key(kind: str, name: str) -> str:
+    return f"{kind}:{name}"
+
+
+# ===================================================================
+# CONFIG INDEX
+# ===================================================================
+
+
+class ConfigIndex:
+    """
+    Every config in the tree as a node with its outgoing references.
+
+    Nodes are keyed "kind:id". `aliases` maps every name a config answers to
+    ("schema:PR", "llm_model:qwen3-8b", ...) to its node key.
+    """
+
+    def __init__(self, config_root: Path = CONFIG_ROOT):
+        self.config_root = config_root
+        self.configs: dict[str, object] = {}
+        self.paths: dict[str, str] = {}
+        self.aliases: dict[str, str] = {}
+        self.references: dict[str, set[str]] = {}
+        self._load()
+        for key, config in self.configs.items():
+            data = config
+            if key.startswith("prompt:"):
+                data = extract_frontmatter(config) or {}
+            self.references[key] = self._resolve_references(data, key)
+
+    # ---------------------------------------------------------------
+    # Loading
+    # ---------------------------------------------------------------
+
+    def _add(self, kind: str, name: str, config, path: str, aliases=()) -> None:
+        key = node_key(kind, name)
+        if key in self.configs:
+            return
+        self.configs[key] = config
+        self.paths[key] = path
+        for alias in (name, *aliases):
+            if alias:
+                self.aliases.setdefault(node_key(kind, str(alias)), key)
+
+    def _load(self) -> None:
+        for kind, directory in YAML_KINDS.items():
+            for config_file in sorted((self.config_root / directory).glob("*.yaml")):
+                if config_file.name.startswith("_"):
+                    continue
+                with open(config_file) as f:
+                    config = yaml.safe_load(f) or {}
+                relative = config_file.relative_to(self.config_root).as_posix()
+                aliases = list(config.get("aliases") or [])
+                if kind == "schema":
+                    name = config.get("id") or config.get("class")
+                    aliases += [config.get("class"), config.get("collection_name")]
+                else:
+                    name = config.get("id") or config_file.stem
+                    aliases.append(config_file.stem)
+                self._add(kind, str(name), config, relative, aliases)
+
+        prompts_dir = self.config_root / PROMPTS_DIR.name
+        for prompty_file in sorted(prompts_dir.rglob("*.prompty")):
+            relative = prompty_file.relative_to(prompts_dir)
+            if prompty_file.name.startswith("_") or has_archived_parent(relative):
+                continue
+            content = prompty_file.read_text(encoding="utf-8")
+            frontmatter = extract_frontmatter(content) or {}
+            name = (
+                str(frontmatter["id"])
+                if frontmatter.get("id")
+                else relative.with_suffix("").as_posix()
+            )
+            path = prompty_file.relative_to(self.config_root).as_posix()
+            self._add("prompt", name, content, path, [prompty_file.stem])
+
+        services_file = self.config_root / SERVICES_FILE.name
+        if services_file.exists():
+            with open(services_file) as f:
+                services = (yaml.safe_load(f) or {}).get("services") or {}
+            for service_id, service in services.items():
+                path = f"{SERVICES_FILE.name}#{service_id}"
+                self._add("service", service_id, service, path)
+
+    # ---------------------------------------------------------------
+    # References
+    # ---------------------------------------------------------------
+
+    def resolve(self, kind: str, name: str) -> str | None:
+        """Return the node key for a config name or alias (None if unknown)."""
+        return self.aliases.get(node_key(kind, name))
+
+    def _resolve_references(self, data, own_key: str) -> set[str]:
+        found: set[str] = set()
+
+        def visit(value, kind: str | None = None):
+            if isinstance(value, dict):
+                for child_key, child in value.items():
+                    visit(child, REFERENCE_KEYS.get(child_key))
+            elif isinstance(value, list):
+                for item in value:
+                    visit(item, kind)
+            elif isinstance(value, str):
+                if value.startswith("prompty:"):
+                    target = self.resolve("prompt", value.removeprefix("prompty:"))
+                elif kind is not None:
+                    target = self.resolve(kind, value)
+                else:
+                    target = None
+                if target and target != own_key:
+                    found.add(target)
+
+        visit(data)
+        return found
+
+    def collections_of(self, key: str) -> set[str]:
+        """Schema node keys referenced directly by a config."""
+        return {ref for ref in self.references[key] if ref.startswith("schema:")}
+
+    def closure(self, roots: set[str]) -> set[str]:
+        """Roots plus everything they reference, transitively."""
+        seen = set(roots)
+        stack = list(roots)
+        while stack:
+            for ref in self.references[stack.pop()]:
+                if ref not in seen:
+                    seen.add(ref)
+                    stack.append(ref)
+        return seen
+
+    def source_hash(self) -> str:
+        """Hash of every indexed file and of this script."""
+        digest = hashlib.sha256(Path(__file__).read_bytes())
+        for path in sorted({p.split("#")[0] for p in self.paths.values()}):
+            digest.update(path.encode())
+            digest.update((self.config_root / path).read_bytes())
+        return digest.hexdigest()[:16]
+
+
+# ===================================================================
+# SHARDS
+# ===================================================================
+
+
+def shard_roots(
+    index: ConfigIndex, tenant: str | None = None, instance: str | None = None
+) -> tuple[set[str], list[str]]:
+    """
+    Pick a shard's root configs.
+
+    Returns:
+        (root node keys, collection names that don't resolve to a schema)
+    """
+    roots: set[str] = set()
+    unresolved: list[str] = []
+
+    if tenant:
+        tenant_key = index.resolve("tenant", tenant)
+        if tenant_key is None:
+            raise KeyError(f"Unknown tenant '{tenant}'")
+        roots.add(tenant_key)
+        routing = index.configs[tenant_key].get("collections") or {}
+        for collection, routed_to in routing.items():
+            if instance and routed_to != instance:
+                continue
+            schema_key = index.resolve("schema", collection)
+            if schema_key is None:
+                unresolved.append(collection)
+            else:
+                roots.add(schema_key)
+    elif instance:
+        for key, config in index.configs.items():
+            if (
+                key.startswith("schema:")
+                and config.get("weaviate_instance") == instance
+            ):
+                roots.add(key)
+
+    if instance:
+        for key, config in index.configs.items():
+            if key.startswith("service:") and config.get("category") == instance:
+                roots.add(key)
+
+    collections = {key for key in roots if key.startswith("schema:")}
+    for key in index.configs:
+        if key.split(":", 1)[0] not in CONSUMER_KINDS:
+            continue
+        used = index.collections_of(key)
+        if used and used <= collections:
+            roots.add(key)
+
+    return roots, unresolved
+
+
+def build_shard(
+    index: ConfigIndex,
+    name: str,
+    tenant: str | None = None,
+    instance: str | None = None,
+) -> dict:
+    """Compute one shard: its roots, their closure and the configs themselves."""
+    roots, unresolved = shard_roots(index, tenant, instance)
+    members = index.closure(roots)
+    return {
+        "name": name,
+        "tenant": tenant,
+        "instance": instance,
+        "roots": sorted(roots),
+        "unresolved_collections": unresolved,
+        "configs": {key: index.configs[key] for key in sorted(members)},
+        # Where everything else lives, for ShardLoader's lazy reads
+        "paths": index.paths,
+        "aliases": index.aliases,
+    }
+
+
+def default_shards(index: ConfigIndex) -> list[tuple[str, str | None, str | None]]:
+    """(name, tenant, instance) for every tenant and every weaviate instance."""
+    shards = [
+        (f"tenant-{key.split(':', 1)[1]}", key.split(":", 1)[1], None)
+        for key in index.configs
+        if key.startswith("tenant:")
+    ]
+    instances = sorted(
+        {
+            config["weaviate_instance"]
+            for key, config in index.configs.items()
+            if key.startswith("schema:") and config.get("weaviate_instance")
+        }
+    )
+    shards += [(f"instance-{instance}", None, instance) for instance in instances]
+    return shards
+
+
+def shard_name(tenant: str | None, instance: str | None) -> str:
+    parts = []
+    if tenant:
+        parts.append(f"tenant-{tenant}")
+    if instance:
+        parts.append(f"instance-{instance}")
+    return "--".join(parts)
+
+
+def build_shards(
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    specs: list[tuple[str, str | None, str | None]] | None = None,
+    config_root: Path = CONFIG_ROOT,
+    force: bool = False,
+) -> tuple[dict[str, dict], int]:
+    """
+    Write shards to `output_dir`, skipping shards whose sources are unchanged.
+
+    Returns:
+        (shards keyed by name, number of shards reused from the cache)
+    """
+    with tracer.span("index_configs"):
+        index = ConfigIndex(config_root)
+    current_hash = index.source_hash()
+    specs = specs if specs is not None else default_shards(index)
+
+    shards: dict[str, dict] = {}
+    reused = 0
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for name, tenant, instance in specs:
+        shard_file = output_dir / f"{name}.json"
+        if not force and shard_file.exists():
+            with open(shard_file) as f:
+                previous = json.load(f)
+            if previous.get("hash") == current_hash:
+                shards[name] = previous
+                reused += 1
+                continue
+
+        with tracer.span("build_shard", shard=name):
+            shard = build_shard(index, name, tenant, instance)
+        shard["hash"] = current_hash
+        with open(shard_file, "w") as f:
+            json.dump(shard, f, default=str)
+        tracer.count("shard_configs", len(shard["configs"]), shard=name)
+        shards[name] = shard
+
+    return shards, reused
+
+
+# ===================================================================
+# LOADING
+# ===================================================================
+
+
+class ShardLoader:
+    """
+    Config access backed by a shard, falling back to the tree on demand.
+
+    get() returns parsed YAML for YAML configs and services, and the raw
+    .prompty text for prompts - the same shapes the shard stores. Every get()
+    counts once: `hits` were served from memory (the shard, or a config loaded
+    earlier), `lazy_loads` had to read the tree.
+    """
+
+    def __init__(self, shard_path: Path | str, config_root: Path = CONFIG_ROOT):
+        with open(shard_path) as f:
+            shard = json.load(f)
+        self.name = shard["name"]
+        self.config_root = config_root
+        self.configs: dict[str, object] = shard["configs"]
+        self.paths: dict[str, str] = shard["paths"]
+        self.aliases: dict[str, str] = shard["aliases"]
+        self.shard_keys = set(self.configs)
+        self.hits = 0
+        self.lazy_loads = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.shard_keys
+
+    def resolve(self, kind: str, name: str) -> str:
+        key = self.aliases.get(node_key(kind, name))
+        if key is None:
+            raise KeyError(f"No {kind} named '{name}'")
+        return key
+
+    def get(self, kind: str, name: str):
+        """Return a config by kind and name/alias, reading the tree if not sharded."""
+        key = self.resolve(kind, name)
+        if key in self.configs:
+            self.hits += 1
+            return self.configs[key]
+
+        self.lazy_loads += 1
+        tracer.count("shard_lazy_loads", shard=self.name)
+        path, _, entry = self.paths[key].partition("#")
+        file_path = self.config_root / path
+        if file_path.suffix == ".prompty":
+            config = file_path.read_text(encoding="utf-8")
+        else:
+            with open(file_path) as f:
+                config = yaml.safe_load(f) or {}
+            if entry:
+                config = config["services"][entry]
+        self.configs[key] = config
+        return config
+
+    def keys(self, kind: str | None = None) -> list[str]:
+        """Node keys held by the shard itself (optionally of one kind)."""
+        return sorted(
+            key for key in self.shard_keys if kind is None or key.startswith(f"{kind}:")
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--tenant", help="Shard for one tenant's collections")
+    parser.add_argument("--instance", help="Shard for one weaviate instance")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--force", action="store_true", help="Rebuild unchanged shards")
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    configure_tracing(args)
+    try:
+        print("🧩 BUILDING CONFIG SHARDS")
+        print("=" * 70)
+
+        specs = None
+        if args.tenant or args.instance:
+            specs = [
+                (shard_name(args.tenant, args.instance), args.tenant, args.instance)
+            ]
+        try:
+            shards, reused = build_shards(args.output_dir, specs, force=args.force)
+        except KeyError as e:
+            print(f"❌ {e.args[0]}")
+            return 1
+
+        for name, shard in shards.items():
+            total = len(shard["paths"])
+            size = (args.output_dir / f"{name}.json").stat().st_size
+            configs = shard["configs"]
+            kinds: dict[str, int] = {}
+            for key in configs:
+                kind = key.split(":", 1)[0]
+                kinds[kind] = kinds.get(kind, 0) + 1
+            breakdown = ", ".join(f"{n} {kind}" for kind, n in sorted(kinds.items()))
+            print(f"  ✓ {name}: {len(configs)}/{total} configs, {size / 1024:.0f} KB")
+            print(f"      {breakdown}")
+            for collection in shard["unresolved_collections"]:
+                print(f"      ⚠️  {collection}: routed collection has no schema")
+
+        print(f"\n📋 {len(shards)} shards ({reused} reused from cache)")
+        print(f"✅ Saved to: {args.output_dir}")
+        return 0
+    finally:
+        tracer.finish()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
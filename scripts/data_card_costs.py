@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Data Card Fetch Cost Model and Executor Plan Cache
+
+Resolves every data_cards/*.yaml against the schemas it touches and reports,
+per card:
+    - projected property width (properties actually fetched)
+    - reference hops and fan-out (referenced objects per root object)
+    - estimated bytes per root object and per 1,000 objects
+
+Each resolved card is cached as a ready-to-run executor plan (collections,
+projected properties, reference paths) keyed by card id. Plans are rebuilt
+only when the card or one of its schemas changes.
+
+User-facing cards (`display: true`) whose payload per 1,000 objects exceeds
+the budget are flagged - typically "fullset" cards that fetch every field set
+across every researcher.
+
+Output: data_cards/_compiled/executor_plans.json (git-ignored build cache)
+
+Usage:
+    python scripts/data_card_costs.py
+    python scripts/data_card_costs.py --budget-mb 10
+    python scripts/data_card_costs.py --card entity_research_sfdc_linked_fullset
+
+Resolution rules:
+    - Explicit `field_sets` lists on the card win; otherwise properties are
+      selected by schema `sets` matching the card's field_set(s).
+    - `field_tags` narrow selection on research-group collections only
+      (Domain / Opportunity keep their field sets).
+    - Explicit `references` are followed as declared. Nodes without explicit
+      references auto-discover schema references when `dynamic_templates`
+      is on, up to `traversal.max_depth`, honouring `skip` policies and never
+      re-entering a collection already on the path.
+
+Byte sizes are estimates (see BYTES_PER_TYPE / BYTES_PER_TAG / BYTES_PER_NAME),
+meant for comparing cards, not for capacity planning.
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import yaml
+
+from instrumentation import add_trace_arguments, configure_tracing, tracer
+from schema_index import (
+    SCHEMAS_DIR,
+    data_type,
+    load_schemas_with_files,
+    property_map,
+)
+
+CONFIG_ROOT = Path(__file__).parent.parent
+DATA_CARDS_DIR = CONFIG_ROOT / "data_cards"
+SCHEMA_INDEX_FILE = Path(__file__).with_name("schema_index.py")
+DEFAULT_OUTPUT = DATA_CARDS_DIR / "_compiled" / "executor_plans.json"
+
+DEFAULT_BUDGET_MB = 25.0
+
+# Estimated serialized bytes per value, by base dataType
+BYTES_PER_TYPE = {
+    "text": 120,
+    "int": 8,
+    "number": 10,
+    "boolean": 5,
+    "date": 25,
+    "uuid": 36,
+    "geoCoordinates": 40,
+    "phoneNumber": 20,
+    "object": 400,
+    "blob": 10000,
+}
+
+# Long-form values that override the dataType estimate
+BYTES_PER_TAG = {"LLM": 1500}
+BYTES_PER_NAME = {"content": 4000}
+
+# Elements assumed per array value, and objects per multi-valued reference
+ARRAY_LENGTH = 5
+MULTI_REF_FANOUT = 5
+
+
+# ===================================================================
+# PROPERTY SELECTION
+# ===================================================================
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def property_bytes(prop: dict) -> int:
+    """Estimated serialized size of one property value (plus its JSON key)."""
+    base_type, is_array = data_type(prop)
+    size = BYTES_PER_TYPE.get(base_type, BYTES_PER_TYPE["text"])
+    for tag in prop.get("tags") or []:
+        size = max(size, BYTES_PER_TAG.get(tag, 0))
+    size = BYTES_PER_NAME.get(prop["name"], size)
+    if is_array:
+        size *= ARRAY_LENGTH
+    return size + len(prop["name"]) + 4
+
+
+def select_properties(
+    schema: dict, field_sets: list[str], field_tags: list[str]
+) -> list[str]:
+    """Properties in any of `field_sets`, narrowed by `field_tags` for research schemas."""
+    wanted_sets = set(field_sets) or {"standard"}
+    apply_tags = bool(field_tags) and schema.get("group") == "research"
+    selected = []
+    for prop in schema.get("properties") or []:
+        if not wanted_sets & set(prop.get("sets") or []):
+            continue
+        if apply_tags and not set(field_tags) & set(prop.get("tags") or []):
+            continue
+        selected.append(prop["name"])
+    return selected
+
+
+def _explicit_fields(card: dict, field_set: str) -> list[str] | None:
+    """Field names from the card's own `field_sets` block, if it defines one."""
+    field_sets = card.get("field_sets") or {}
+    block = field_sets.get(field_set)
+    if block is None:
+        return None
+    entries = block.get("fields", []) if isinstance(block, dict) else block
+    names = []
+    for entry in entries or []:
+        if isinstance(entry, str):
+            names.append(entry)
+        elif entry.get("source", "property") == "property":
+            names.append(entry["name"])
+    return names
+
+
+def _fanout(schema: dict, reference: dict) -> int:
+    source = reference.get("uuid_source_field")
+    if source == "manual":
+        return MULTI_REF_FANOUT
+    prop = property_map(schema).get(source)
+    if prop is not None and data_type(prop)[1]:
+        return MULTI_REF_FANOUT
+    return 1
+
+
+# ===================================================================
+# CARD RESOLUTION
+# ===================================================================
+
+
+class CardResolver:
+    """Resolve one data card into a tree of fetch nodes."""
+
+    def __init__(self, card: dict, schemas: dict[str, dict]):
+        self.card = card
+        self.schemas = schemas
+        self.parameters = card.get("parameters") or {}
+        traversal = self.parameters.get("traversal") or {}
+        self.max_depth = traversal.get("max_depth", 1)
+        self.skip = {
+            name
+            for name, policy in (traversal.get("policies") or {}).items()
+            if policy == "skip"
+        }
+        self.field_tags = _as_list(card.get("field_tags"))
+        self.nodes: list[dict] = []
+        self.warnings: list[str] = []
+        # Every collection looked up, resolved or not - the plan's cache inputs
+        self.schemas_read: list[str] = []
+
+    def _schema(self, collection: str) -> dict | None:
+        if collection not in self.schemas_read:
+            self.schemas_read.append(collection)
+        schema = self.schemas.get(collection)
+        if schema is None:
+            self.warnings.append(f"schema not found for collection {collection}")
+        return schema
+
+    def _add_node(
+        self,
+        collection: str,
+        path: list[str],
+        fanout: int,
+        field_sets: list[str],
+        explicit: list[str] | None = None,
+    ) -> dict | None:
+        schema = self._schema(collection)
+        if schema is None:
+            return None
+        properties = property_map(schema)
+        if explicit is not None:
+            missing = [name for name in explicit if name not in properties]
+            for name in missing:
+                self.warnings.append(f"{collection}.{name}: not a schema property")
+            selected = [name for name in explicit if name in properties]
+        else:
+            selected = select_properties(schema, field_sets, self.field_tags)
+
+        node = {
+            "collection": collection,
+            "path": ".".join(path) or collection,
+            "depth": len(path),
+            "fanout": fanout,
+            "properties": selected,
+            "bytes_per_object": sum(property_bytes(properties[n]) for n in selected),
+        }
+        self.nodes.append(node)
+        return node
+
+    def _follow(
+        self,
+        collection: str,
+        spec: dict,
+        path: list[str],
+        visited: list[str],
+        fanout: int,
+        dynamic: bool,
+    ) -> None:
+        """Follow explicit references in `spec`, else auto-discover from the schema."""
+        if len(path) >= self.max_depth:
+            return
+        schema = self.schemas.get(collection) or {}
+        references = {r["name"]: r for r in schema.get("references") or []}
+        explicit = spec.get("references") or {}
+
+        if explicit:
+            for name, child in explicit.items():
+                reference = references.get(name, {})
+                target = child.get("target_collection") or reference.get(
+                    "target_collection"
+                )
+                if not target:
+                    self.warnings.append(f"{collection}.{name}: unknown reference")
+                    continue
+                child_fanout = fanout * _fanout(schema, reference)
+                node = self._add_node(
+                    target,
+                    path + [name],
+                    child_fanout,
+                    _as_list(child.get("field_set")) or ["standard"],
+                )
+                if node:
+                    self._follow(
+                        target,
+                        child,
+                        path + [name],
+                        visited + [target],
+                        child_fanout,
+                        child.get("dynamic_templates", dynamic),
+                    )
+            return
+
+        if not dynamic:
+            return
+        for name, reference in references.items():
+            target = reference.get("target_collection")
+            if name in self.skip or not target or target in visited:
+                continue
+            child_fanout = fanout * _fanout(schema, reference)
+            if self._add_node(target, path + [name], child_fanout, ["standard"]):
+                self._follow(
+                    target, {}, path + [name], visited + [target], child_fanout, True
+                )
+
+    def resolve(self) -> list[dict]:
+        card = self.card
+        params = self.parameters
+        root = params.get("collection") or card.get("collection")
+        entries = card.get("collections") or []
+        if not root and entries:
+            root = entries[0].get("collection")
+        if not root:
+            self.warnings.append("no root collection")
+            return []
+
+        root_entry = next((e for e in entries if e.get("collection") == root), {})
+        field_set = (
+            params.get("field_set_default") or params.get("field_set") or "standard"
+        )
+        field_sets = _as_list(root_entry.get("field_set") or field_set)
+        explicit = _explicit_fields(card, field_sets[0])
+        if not self._add_node(root, [], 1, field_sets, explicit):
+            return []
+
+        traverse = params.get("relationship_traversal", False) or bool(
+            root_entry.get("references")
+        )
+        dynamic = params.get("dynamic_templates", False)
+        if traverse:
+            self._follow(root, root_entry, [], [root], 1, dynamic)
+
+        # Remaining `collections` entries: hop from the root when a reference
+        # reaches them, otherwise fetch them alongside the root.
+        included = {node["collection"] for node in self.nodes}
+        root_schema = self.schemas.get(root) or {}
+        root_refs = {
+            r.get("target_collection"): r for r in root_schema.get("references") or []
+        }
+        for entry in entries:
+            collection = entry.get("collection")
+            if entry is root_entry or collection in included:
+                continue
+            reference = root_refs.get(collection)
+            path = [reference["name"]] if reference else []
+            fanout = _fanout(root_schema, reference) if reference else 1
+            node = self._add_node(
+                collection, path, fanout, _as_list(entry.get("field_set"))
+            )
+            if node:
+                included.add(collection)
+                if entry.get("references"):
+                    self._follow(collection, entry, [], [collection], 1, dynamic)
+        return self.nodes
+
+
+def card_cost(nodes: list[dict]) -> dict:
+    """Aggregate a resolved node tree into cost figures per root object."""
+    bytes_per_object = sum(n["bytes_per_object"] * n["fanout"] for n in nodes)
+    return {
+        "collections": len(nodes),
+        "property_width": sum(len(n["properties"]) for n in nodes),
+        "reference_hops": max((n["depth"] for n in nodes), default=0),
+        "fanout": sum(n["fanout"] for n in nodes if n["depth"] > 0),
+        "bytes_per_object": bytes_per_object,
+        "mb_per_1000": round(bytes_per_object * 1000 / 1_000_000, 2),
+    }
+
+
+# ===================================================================
+# PLAN CACHE
+# ===================================================================
+
+
+def _plan_hash(card_file: Path, collections: list[str], files: dict) -> str:
+    # The cost model and schema helpers are part of the key - editing either
+    # invalidates plans
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(SCHEMA_INDEX_FILE.read_bytes())
+    digest.update(card_file.read_bytes())
+    for collection in sorted(set(collections)):
+        if collection in files:
+            digest.update(files[collection].read_bytes())
+        else:
+            # Adding the schema later must invalidate the plan
+            digest.update(f"missing:{collection}".encode())
+    return digest.hexdigest()[:16]
+
+
+def build_plan(card: dict, schemas: dict[str, dict]) -> dict:
+    """Resolve a card into its executor plan with cost figures."""
+    resolver = CardResolver(card, schemas)
+    nodes = resolver.resolve()
+    params = card.get("parameters") or {}
+    return {
+        "card_id": card.get("id"),
+        "executor": card.get("executor"),
+        "target_scope": card.get("target_scope"),
+        "display": bool(card.get("display", False)),
+        "limit": params.get("limit_default") or params.get("limit"),
+        "nodes": nodes,
+        "cost": card_cost(nodes),
+        "warnings": resolver.warnings,
+        "schemas_read": resolver.schemas_read,
+    }
+
+
+def build_plans(
+    output: Path = DEFAULT_OUTPUT,
+    card_ids: list[str] | None = None,
+    cards_dir: Path = DATA_CARDS_DIR,
+    schemas_dir: Path = SCHEMAS_DIR,
+) -> tuple[dict[str, dict], int]:
+    """
+    Build executor plans for all cards, reusing cached plans whose card and
+    schemas are unchanged.
+
+    Returns:
+        (plans keyed by card id, number of plans reused from the cache)
+    """
+    cached: dict[str, dict] = {}
+    if output.exists():
+        with open(output) as f:
+            cached = json.load(f).get("plans", {})
+
+    schemas, files = load_schemas_with_files(schemas_dir)
+    plans: dict[str, dict] = {}
+    reused = 0
+
+    for card_file in sorted(cards_dir.glob("*.yaml")):
+        if card_file.name.startswith("_"):
+            continue
+        with open(card_file) as f:
+            card = yaml.safe_load(f) or {}
+        card_id = card.get("id") or card_file.stem
+        if card_ids and card_id not in card_ids:
+            continue
+
+        previous = cached.get(card_id)
+        if previous:
+            collections = previous.get("schemas_read", [])
+            if previous.get("hash") == _plan_hash(card_file, collections, files):
+                plans[card_id] = previous
+                reused += 1
+                continue
+
+        with tracer.span("build_plan", card=card_id):
+            plan = build_plan(card, schemas)
+        tracer.count("plans_built")
+        plan["hash"] = _plan_hash(card_file, plan["schemas_read"], files)
+        plans[card_id] = plan
+
+    if not card_ids:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w") as f:
+            json.dump({"plans": plans}, f, indent=2)
+    return plans, reused
+
+
+def over_budget(plans: dict[str, dict], budget_mb: float) -> list[dict]:
+    """User-facing (`display: true`) plans whose MB per 1,000 objects exceeds budget."""
+    return [
+        plan
+        for plan in plans.values()
+        if plan["display"] and plan["cost"]["mb_per_1000"] > budget_mb
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--budget-mb", type=float, default=DEFAULT_BUDGET_MB)
+    parser.add_argument("--card", action="append", help="Only these card ids")
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    configure_tracing(args)
+    try:
+        print("💰 DATA CARD FETCH COSTS")
+        print("=" * 90)
+
+        plans, reused = build_plans(args.output, args.card)
+
+        print(
+            f"   {'Card':<40} {'Width':>6} {'Hops':>5} {'Fan-out':>8} "
+            f"{'KB/obj':>8} {'MB/1k':>8}"
+        )
+        flagged_cards = over_budget(plans, args.budget_mb)
+        ordered = sorted(
+            plans.values(), key=lambda p: p["cost"]["mb_per_1000"], reverse=True
+        )
+        for plan in ordered:
+            cost = plan["cost"]
+            flagged = plan in flagged_cards
+            icon = "🚩" if flagged else ("👁️ " if plan["display"] else "  ")
+            print(
+                f"{icon} {plan['card_id']:<40} {cost['property_width']:>6} "
+                f"{cost['reference_hops']:>5} {cost['fanout']:>8} "
+                f"{cost['bytes_per_object'] / 1024:>8.1f} {cost['mb_per_1000']:>8.2f}"
+            )
+            for warning in plan["warnings"]:
+                print(f"      ⚠️  {warning}")
+
+        print("\n" + "=" * 90)
+        print(f"📋 {len(plans)} plans ({reused} reused from cache)")
+        tracer.count("plans_reused", reused)
+        if not args.card:
+            print(f"✅ Saved to: {args.output}")
+        if flagged_cards:
+            print(
+                f"🚩 {len(flagged_cards)} user-facing card(s) exceed "
+                f"{args.budget_mb:g} MB per 1,000 objects:"
+            )
+            for plan in flagged_cards:
+                print(f"   - {plan['card_id']}: {plan['cost']['mb_per_1000']:.1f} MB")
+            return 1
+        return 0
+    finally:
+        tracer.finish()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,19 @@
 Post-processor for cleaning entityName values from LLM output.
 Strips web title patterns like "Company | Tagline" → "Company"
 """
+
 import re
 
 SEPARATORS = [" | ", " - ", " :: ", " – ", " — "]
 
+TRAILING_SEPARATOR = re.compile(r"\s*[|–—]\s*.*$")
+TRAILING_TRADEMARK = re.compile(r"[™®©]+$")
+
+# Names that mean the title wasn't a real entity name
+GENERIC_NAMES = frozenset(
+    ["home", "welcome", "official", "please", "error", "404", "not found"]
+)
+
 
 def clean_entity_name(name: str, domain: str = "") -> str:
     """
@@ -26,22 +35,13 @@ def clean_entity_name(name: str, domain: str = "") -> str:
             break
 
     # Also handle single character separators at the end
-    name = re.sub(r"\s*[|–—]\s*.*$", "", name).strip()
+    name = TRAILING_SEPARATOR.sub("", name).strip()
 
     # Remove trademark symbols at the end
-    name = re.sub(r"[™®©]+$", "", name).strip()
+    name = TRAILING_TRADEMARK.sub("", name).strip()
 
     # If result is just the domain or generic, return empty to trigger re-extraction
-    generic_names = [
-        "home",
-        "welcome",
-        "official",
-        "please",
-        "error",
-        "404",
-        "not found",
-    ]
-    if name.lower() in generic_names:
+    if name.lower() in GENERIC_NAMES:
         return ""
     if domain and name.lower() == domain.lower():
         return ""
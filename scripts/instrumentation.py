@@ -0,0 +1,211 @@
+"""
+Lightweight timing instrumentation shared by pom-config scripts.
+
+Nested timing spans, named counters and a memory high-water mark, emitted as
+JSON-lines traces and optionally as a Chrome trace-event file (open in
+chrome://tracing or https://ui.perfetto.dev). Disabled unless a trace flag is
+passed, in which case a "slowest spans" summary is also printed.
+
+Usage in a script:
+    from instrumentation import add_trace_arguments, configure_tracing, tracer
+
+    parser = argparse.ArgumentParser()
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    configure_tracing(args)
+
+    with tracer.span("validate_directory", dir="schemas"):
+        for yaml_file in files:
+            with tracer.span("validate_file", file=yaml_file.name):
+                ...
+            tracer.count("files_validated", dir="schemas")
+
+    tracer.finish()   # writes trace files + prints summary
+
+Then:
+    python scripts/validate_all_configs.py --trace /tmp/validate.jsonl
+    python scripts/validate_all_configs.py --chrome-trace /tmp/validate.json
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_current_span: ContextVar[dict | None] = ContextVar("current_span", default=None)
+
+
+def max_rss_kb() -> int | None:
+    """Peak resident set size of this process in KB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class Tracer:
+    """Collects spans and counters; no-op until enabled."""
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_path: Path | None = None
+        self.chrome_trace_path: Path | None = None
+        self.spans: list[dict] = []
+        self.counters: dict[str, int] = {}
+        self._origin = time.perf_counter()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def configure(
+        self, trace_path: Path | None = None, chrome_trace_path: Path | None = None
+    ) -> None:
+        self.trace_path = trace_path
+        self.chrome_trace_path = chrome_trace_path
+        self.enabled = bool(trace_path or chrome_trace_path)
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Time a block; spans opened inside it become its children."""
+        if not self.enabled:
+            yield None
+            return
+
+        parent = _current_span.get()
+        with self._lock:
+            self._next_id += 1
+            span_id = self._next_id
+        record = {
+            "id": span_id,
+            "parent": parent["id"] if parent else None,
+            "depth": parent["depth"] + 1 if parent else 0,
+            "name": name,
+            "attrs": attrs,
+            "tid": threading.get_ident(),
+        }
+        token = _current_span.set(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = type(e).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            _current_span.reset(token)
+            record["start_ms"] = round((start - self._origin) * 1000, 3)
+            record["duration_ms"] = round((end - start) * 1000, 3)
+            record["max_rss_kb"] = max_rss_kb()
+            with self._lock:
+                self.spans.append(record)
+
+    def count(self, name: str, value: int = 1, **labels) -> None:
+        """Increment a counter; labels become part of its key (name{k=v})."""
+        if not self.enabled:
+            return
+        if labels:
+            label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+            name = f"{name}{{{label_str}}}"
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    # ===============================================================
+    # OUTPUT
+    # ===============================================================
+
+    def _write_jsonl(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            f.writelines(
+                json.dumps({"type": "span", **record}, default=str) + "\n"
+                for record in sorted(self.spans, key=lambda r: r["start_ms"])
+            )
+            f.writelines(
+                json.dumps({"type": "counter", "name": name, "value": value}) + "\n"
+                for name, value in sorted(self.counters.items())
+            )
+            f.write(json.dumps({"type": "memory", "max_rss_kb": max_rss_kb()}) + "\n")
+
+    def _write_chrome_trace(self, path: Path) -> None:
+        pid = os.getpid()
+        events = [
+            {
+                "name": record["name"],
+                "ph": "X",
+                "ts": record["start_ms"] * 1000,
+                "dur": record["duration_ms"] * 1000,
+                "pid": pid,
+                "tid": record["tid"],
+                "args": {k: str(v) for k, v in record["attrs"].items()},
+            }
+            for record in self.spans
+        ]
+        end_us = max((e["ts"] + e["dur"] for e in events), default=0)
+        events.extend(
+            {"name": name, "ph": "C", "ts": end_us, "pid": pid, "args": {"value": v}}
+            for name, v in self.counters.items()
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def print_summary(self, top: int = 10) -> None:
+        """Print the slowest spans, all counters and the memory high-water mark."""
+        if not self.spans:
+            return
+        print("\n⏱️  TRACE SUMMARY")
+        print("-" * 70)
+        print(f"   {'Span':<48} {'ms':>10}")
+        for record in sorted(self.spans, key=lambda r: -r["duration_ms"])[:top]:
+            detail = ", ".join(f"{k}={v}" for k, v in record["attrs"].items())
+            label = f"{record['name']} ({detail})" if detail else record["name"]
+            print(f"   {label[:48]:<48} {record['duration_ms']:>10.1f}")
+        for name, value in sorted(self.counters.items()):
+            print(f"   # {name}: {value}")
+        peak = max_rss_kb()
+        if peak is not None:
+            print(f"   📈 Peak RSS: {peak / 1024:.1f} MB")
+
+    def finish(self) -> None:
+        """Write configured trace files and print the summary."""
+        if not self.enabled:
+            return
+        if self.trace_path:
+            self._write_jsonl(self.trace_path)
+        if self.chrome_trace_path:
+            self._write_chrome_trace(self.chrome_trace_path)
+        self.print_summary()
+        for path in (self.trace_path, self.chrome_trace_path):
+            if path:
+                print(f"   📝 Trace written to: {path}")
+
+
+tracer = Tracer()
+
+
+def add_trace_arguments(parser) -> None:
+    """Add --trace / --chrome-trace flags to an argparse parser."""
+    parser.add_argument(
+        "--trace", type=Path, metavar="FILE", help="Write a JSON-lines timing trace"
+    )
+    parser.add_argument(
+        "--chrome-trace",
+        type=Path,
+        metavar="FILE",
+        help="Write a Chrome trace-event file (chrome://tracing, Perfetto)",
+    )
+
+
+def configure_tracing(args) -> Tracer:
+    """Enable the shared tracer from parsed --trace / --chrome-trace flags."""
+    tracer.configure(args.trace, args.chrome_trace)
+    return tracer
@@ -0,0 +1,29 @@
+"""
+Shared prompty file helpers for pom-config scripts.
+
+Prompts under a `_`-prefixed directory (prompts/_archive/, prompts/_compiled/)
+or with a `_`-prefixed file name are inactive and skipped by the build tools.
+"""
+
+from pathlib import Path
+
+import yaml
+
+CONFIG_ROOT = Path(__file__).parent.parent
+PROMPTS_DIR = CONFIG_ROOT / "prompts"
+
+
+def has_archived_parent(path: Path) -> bool:
+    """Return True if any parent directory starts with '_'."""
+    return any(part.startswith("_") for part in path.parts)
+
+
+def extract_frontmatter(content: str) -> dict | None:
+    """Extract YAML frontmatter from prompty content."""
+    if not content.startswith("---"):
+        return None
+    parts = content.split("---", 2)
+    if len(parts) < 3:
+        return None
+    yaml_content = parts[1]
+    return yaml.safe_load(yaml_content) if yaml_content else None
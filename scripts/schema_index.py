@@ -0,0 +1,48 @@
+"""
+Shared schema lookup helpers for pom-config scripts.
+
+Schemas are addressed by `schema_id` elsewhere in the tree (ux_configs,
+data_cards, prompts). A schema answers to its `id` and to its `class`
+(e.g. Pr_schema.yaml is both "Pr" and "PR").
+"""
+
+from pathlib import Path
+
+import yaml
+
+CONFIG_ROOT = Path(__file__).parent.parent
+SCHEMAS_DIR = CONFIG_ROOT / "schemas"
+
+
+def load_schemas_with_files(
+    schemas_dir: Path = SCHEMAS_DIR,
+) -> tuple[dict[str, dict], dict[str, Path]]:
+    """Load all schemas and their source files, both keyed by `id` and `class`."""
+    index: dict[str, dict] = {}
+    files: dict[str, Path] = {}
+    for schema_file in sorted(schemas_dir.glob("*.yaml")):
+        if schema_file.name.startswith("_"):
+            continue
+        with open(schema_file) as f:
+            schema = yaml.safe_load(f) or {}
+        for key in (schema.get("id"), schema.get("class")):
+            if key and key not in index:
+                index[key] = schema
+                files[key] = schema_file
+    return index, files
+
+
+def load_schemas(schemas_dir: Path = SCHEMAS_DIR) -> dict[str, dict]:
+    """Load all schemas keyed by both `id` and `class`."""
+    return load_schemas_with_files(schemas_dir)[0]
+
+
+def property_map(schema: dict) -> dict[str, dict]:
+    """Return schema properties keyed by name."""
+    return {prop["name"]: prop for prop in schema.get("properties") or []}
+
+
+def data_type(prop: dict) -> tuple[str, bool]:
+    """Return (base dataType, is_array), e.g. "text[]" → ("text", True)."""
+    raw = (prop.get("dataType") or ["text"])[0]
+    return raw.removesuffix("[]"), raw.endswith("[]")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from compile_response_validators import (  # noqa: E402
+    BENCHMARK_PROMPT_ID,
+    build,
+    build_hash,
+    compile_validators,
+    load_validators,
+    sample_classifier_payload,
+    validate_generic,
+)
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "items": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "score": {"type": "number", "minimum": 0, "maximum": 1},
+                    "kind": {"type": "string", "enum": ["a", "b"]},
+                },
+                "required": ["name"],
+                "additionalProperties": False,
+            },
+        },
+        "counts": {"type": "object", "additionalProperties": {"type": "integer"}},
+    },
+    "required": ["items"],
+}
+
+
+class TestCompileResponseValidators(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tmp = tempfile.TemporaryDirectory()
+        path = Path(cls.tmp.name) / "validators.py"
+        source, skipped = compile_validators({"test": SCHEMA}, {})
+        path.write_text(source)
+        cls.skipped = skipped
+        cls.validate = staticmethod(load_validators(path).RESPONSE_VALIDATORS["test"])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.tmp.cleanup()
+
+    def assert_same_verdict(self, payload, valid: bool) -> None:
+        for validator in (self.validate, lambda d: validate_generic(SCHEMA, d)):
+            if valid:
+                self.assertEqual(validator(payload), payload)
+            else:
+                with self.assertRaises(ValueError):
+                    validator(payload)
+
+    def test_compiles_without_skips(self) -> None:
+        self.assertEqual(self.skipped, [])
+
+    def test_accepts_valid_payload(self) -> None:
+        payload = {
+            "items": [{"name": "x", "score": 0.5, "kind": "a"}],
+            "counts": {"x": 3, "y": 2.0},
+        }
+        self.assert_same_verdict(payload, valid=True)
+
+    def test_rejects_invalid_payloads(self) -> None:
+        invalid = [
+            [],
+            {},
+            {"items": []},
+            {"items": [{"score": 0.5}]},
+            {"items": [{"name": 1}]},
+            {"items": [{"name": "x", "score": 2}]},
+            {"items": [{"name": "x", "score": True}]},
+            {"items": [{"name": "x", "kind": "c"}]},
+            {"items": [{"name": "x", "extra": 1}]},
+            {"items": [{"name": "x"}], "counts": {"x": 1.5}},
+        ]
+        for payload in invalid:
+            with self.subTest(payload=payload):
+                self.assert_same_verdict(payload, valid=False)
+
+    def test_error_reports_path(self) -> None:
+        with self.assertRaises(ValueError) as ctx:
+            self.validate({"items": [{"name": "x"}, {"name": "y", "score": -1}]})
+        self.assertEqual(ctx.exception.path, "data.items[1].score")
+
+    def _compile(self, schema: dict):
+        path = Path(self.tmp.name) / "extra_validators.py"
+        path.write_text(compile_validators({"extra": schema}, {})[0])
+        return load_validators(path).RESPONSE_VALIDATORS["extra"]
+
+    def test_enum_and_const_keep_booleans_apart_from_numbers(self) -> None:
+        cases = [
+            ({"enum": [1, "x"]}, [1, 1.0, "x"], [True, "y"]),
+            ({"enum": [True]}, [True], [1, False]),
+            ({"const": 0}, [0, 0.0], [False]),
+            ({"const": [1, {"a": False}]}, [[1, {"a": False}]], [[True, {"a": 0}]]),
+        ]
+        for schema, valid, invalid in cases:
+            validate = self._compile(schema)
+            for validator in (validate, lambda d, s=schema: validate_generic(s, d)):
+                for payload in valid:
+                    with self.subTest(schema=schema, payload=payload):
+                        self.assertEqual(validator(payload), payload)
+                for payload in invalid:
+                    with (
+                        self.subTest(schema=schema, payload=payload),
+                        self.assertRaises(ValueError),
+                    ):
+                        validator(payload)
+
+    def test_quotes_property_names_in_paths(self) -> None:
+        name = 'a"b\\c'
+        schema = {"type": "object", "properties": {name: {"type": "string"}}}
+        with self.assertRaises(ValueError) as ctx:
+            self._compile(schema)({name: 1})
+        self.assertEqual(ctx.exception.path, f"data.{name}")
+
+    def test_build_hash_covers_the_generator(self) -> None:
+        digest = build_hash({"test": SCHEMA})
+        with patch("pathlib.Path.read_bytes", return_value=b"# edited generator"):
+            self.assertNotEqual(build_hash({"test": SCHEMA}), digest)
+
+    def test_builds_repo_prompts(self) -> None:
+        output = Path(self.tmp.name) / "repo_validators.py"
+        validators = load_validators(build(output))
+        validate = validators.RESPONSE_VALIDATORS[BENCHMARK_PROMPT_ID]
+        payload = sample_classifier_payload(10)
+        self.assertEqual(validate(payload), payload)
+        del payload["classified_facts"][3]["fact_type"]
+        with self.assertRaises(ValueError):
+            validate(payload)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from compile_ux_plans import (  # noqa: E402
+    NUNIQUE_LIMIT,
+    compile_plan,
+    execute_plan,
+    validate_ux_config,
+)
+
+SCHEMA = {
+    "id": "Research_test",
+    "collection_name": "Research_test",
+    "weaviate_instance": "cloud",
+    "properties": [
+        {"name": "riskCat", "dataType": ["text"]},
+        {"name": "competitors", "dataType": ["text[]"]},
+        {"name": "score", "dataType": ["int"]},
+        {"name": "summaryLLM", "dataType": ["text"]},
+        {"name": "public", "dataType": ["boolean"]},
+    ],
+}
+
+UX_CONFIG = {
+    "type": "ux_config",
+    "collection": "Research_test",
+    "schema_id": "Research_test",
+    "fields": [
+        {"name": "riskCat", "aggregations": ["count", "nunique"]},
+        {"name": "competitors", "aggregations": ["count", "nunique"]},
+        {"name": "score", "aggregations": ["count", "sum", "avg", "max", "nunique"]},
+        {"name": "public", "aggregations": ["nunique"]},
+    ],
+}
+
+
+class TestCompileUxPlans(unittest.TestCase):
+    def test_plan_is_one_aggregate_query(self) -> None:
+        aggregate, errors = validate_ux_config(UX_CONFIG, {"Research_test": SCHEMA})
+        plan = compile_plan(UX_CONFIG, SCHEMA, aggregate)
+        self.assertEqual(errors, [])
+        self.assertTrue(plan["query"].startswith("{ Aggregate { Research_test {"))
+        self.assertNotIn("summaryLLM", plan["query"])
+        self.assertEqual(
+            plan["server_fields"]["score"], ["count", "sum", "mean", "maximum"]
+        )
+        self.assertEqual(plan["server_fields"]["public"], ["totalTrue", "totalFalse"])
+        self.assertEqual(plan["client_nunique"], ["score"])
+        self.assertEqual(plan["nunique_fallback"], ["riskCat", "competitors"])
+
+    def test_reports_missing_fields_and_type_mismatches(self) -> None:
+        ux_config = {
+            **UX_CONFIG,
+            "fields": [
+                {"name": "missingField", "aggregations": ["count"]},
+                {"name": "riskCat", "aggregations": ["count", "sum", "median"]},
+            ],
+        }
+        aggregate, errors = validate_ux_config(ux_config, {"Research_test": SCHEMA})
+        self.assertEqual(aggregate, {"riskCat": ["count"]})
+        self.assertEqual(len(errors), 3)
+
+    def _plan(self) -> dict:
+        aggregate, _ = validate_ux_config(UX_CONFIG, {"Research_test": SCHEMA})
+        return compile_plan(UX_CONFIG, SCHEMA, aggregate)
+
+    def test_maps_aggregate_response(self) -> None:
+        response = {
+            "data": {
+                "Aggregate": {
+                    "Research_test": [
+                        {
+                            "meta": {"count": 3},
+                            "riskCat": {
+                                "count": 3,
+                                "topOccurrences": [
+                                    {"value": "high", "occurs": 2},
+                                    {"value": "low", "occurs": 1},
+                                ],
+                            },
+                            "competitors": {"count": 3, "topOccurrences": []},
+                            "score": {"count": 2, "sum": 8, "mean": 4.0, "maximum": 5},
+                            "public": {"totalTrue": 2, "totalFalse": 0},
+                        }
+                    ]
+                }
+            }
+        }
+        fetched = []
+
+        def fetch(properties):
+            fetched.append(properties)
+            return [{"score": 3}, {"score": 5}, {"score": 5}, {"score": None}]
+
+        self.assertEqual(
+            execute_plan(self._plan(), response, fetch),
+            {
+                "riskCat": {"count": 3, "nunique": 2},
+                "competitors": {"count": 3, "nunique": 0},
+                "score": {"count": 2, "sum": 8, "avg": 4.0, "max": 5, "nunique": 2},
+                "public": {"nunique": 1},
+            },
+        )
+        # Only the field Aggregate can't answer is fetched, in one call
+        self.assertEqual(fetched, [["score"]])
+
+    def test_saturated_top_occurrences_fall_back_to_fetch(self) -> None:
+        top = [{"value": f"v{i}", "occurs": 1} for i in range(NUNIQUE_LIMIT)]
+        response = {
+            "Aggregate": {
+                "Research_test": [
+                    {
+                        "riskCat": {"count": 5000, "topOccurrences": top},
+                        "competitors": {"count": 0, "topOccurrences": []},
+                        "score": {"count": 0},
+                        "public": {"totalTrue": 0, "totalFalse": 0},
+                    }
+                ]
+            }
+        }
+        objects = [
+            {"riskCat": "a", "competitors": ["x", "y"], "score": 1},
+            {"riskCat": "b", "competitors": ["y"], "score": 1},
+        ]
+        results = execute_plan(self._plan(), response, lambda props: objects)
+        self.assertEqual(results["riskCat"]["nunique"], 2)
+        self.assertEqual(results["score"]["nunique"], 1)
+        self.assertEqual(results["competitors"]["nunique"], 0)
+        self.assertIsNone(execute_plan(self._plan(), response)["riskCat"]["nunique"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from config_shards import ConfigIndex, ShardLoader, build_shards  # noqa: E402
+
+TREE = {
+    "schemas/Page_facts_schema.yaml": {
+        "id": "Page_facts",
+        "class": "Page_facts",
+        "weaviate_instance": "spark",
+        "references": [{"name": "domainRef", "target_collection": "Domain"}],
+    },
+    "schemas/domain_schema.yaml": {
+        "id": "Domain",
+        "class": "Domain",
+        "collection_name": "domain",
+        "weaviate_instance": "cloud",
+    },
+    "schemas/Research_risk_schema.yaml": {
+        "id": "Research_risk",
+        "class": "Research_risk",
+        "weaviate_instance": "cloud",
+    },
+    "data_cards/page_facts.yaml": {
+        "id": "page_facts",
+        "parameters": {"collection": "Page_facts"},
+    },
+    "data_cards/risk_with_pages.yaml": {
+        "id": "risk_with_pages",
+        "parameters": {
+            "collection": "Research_risk",
+            "references": [{"target_collection": "Page_facts"}],
+        },
+    },
+    "tools/page_facts_search.yaml": {
+        "id": "page_facts_search",
+        "execution": {"collection": "Page_facts"},
+    },
+    "llm_models/qwen3-8b.yaml": {"id": "qwen3:8b", "aliases": ["qwen3-8b"]},
+    "tenant_groups/corporate.yaml": {"id": "corporate"},
+    "tenants/acme.yaml": {
+        "id": "acme",
+        "tenant_group": "corporate",
+        "default_researcher_model": "qwen3-8b",
+        "collections": {"Domain": "cloud", "Research_risk": "cloud"},
+    },
+    "services.yaml": {
+        "services": {
+            "spark_transformers": {"category": "spark"},
+            "mac_weaviate": {"category": "local"},
+        }
+    },
+}
+
+
+class TestConfigShards(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        for relative, config in TREE.items():
+            path = self.root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(yaml.safe_dump(config))
+        (self.root / "prompts").mkdir()
+        (self.root / "prompts" / "risk.prompty").write_text(
+            "---\nname: Risk\nprocessing_config:\n  schema_id: Research_risk\n---\nBody\n"
+        )
+        self.output_dir = self.root / "_compiled" / "shards"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _build(self, tenant=None, instance=None) -> dict:
+        shards, _ = build_shards(
+            self.output_dir, [("shard", tenant, instance)], config_root=self.root
+        )
+        return shards["shard"]
+
+    def test_resolves_references_through_aliases(self) -> None:
+        index = ConfigIndex(self.root)
+        self.assertEqual(
+            index.references["tenant:acme"],
+            {"tenant_group:corporate", "llm_model:qwen3:8b"},
+        )
+        self.assertEqual(index.resolve("schema", "domain"), "schema:Domain")
+
+    def test_instance_shard_holds_consumers_and_closure(self) -> None:
+        shard = self._build(instance="spark")
+        self.assertEqual(
+            sorted(shard["configs"]),
+            [
+                "data_card:page_facts",
+                "schema:Domain",  # referenced by Page_facts
+                "schema:Page_facts",
+                "service:spark_transformers",
+                "tool:page_facts_search",
+            ],
+        )
+
+    def test_tenant_shard_follows_collection_routing(self) -> None:
+        shard = self._build(tenant="acme")
+        self.assertIn("prompt:risk", shard["configs"])
+        self.assertIn("llm_model:qwen3:8b", shard["configs"])
+        self.assertNotIn("schema:Page_facts", shard["configs"])
+        # Reads Page_facts too, which the tenant doesn't route
+        self.assertNotIn("data_card:risk_with_pages", shard["configs"])
+
+    def test_loader_reads_outside_configs_lazily(self) -> None:
+        self._build(instance="spark")
+        loader = ShardLoader(self.output_dir / "shard.json", config_root=self.root)
+        self.assertEqual(
+            loader.get("schema", "Page_facts")["weaviate_instance"], "spark"
+        )
+        self.assertEqual(loader.get("tenant", "acme")["tenant_group"], "corporate")
+        self.assertEqual(loader.get("service", "mac_weaviate"), {"category": "local"})
+        self.assertEqual((loader.hits, loader.lazy_loads), (1, 2))
+        # Lazily loaded configs are cached; later gets count as hits
+        loader.get("tenant", "acme")
+        self.assertEqual((loader.hits, loader.lazy_loads), (2, 2))
+        self.assertNotIn("tenant:acme", loader)
+        with self.assertRaises(KeyError):
+            loader.get("tenant", "missing")
+
+    def test_unchanged_sources_reuse_shard(self) -> None:
+        self._build(instance="spark")
+        _, reused = build_shards(
+            self.output_dir, [("shard", None, "spark")], config_root=self.root
+        )
+        self.assertEqual(reused, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
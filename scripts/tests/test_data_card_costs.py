@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from data_card_costs import build_plans, over_budget  # noqa: E402
+
+SCHEMAS = {
+    "domain_schema.yaml": {
+        "id": "Domain",
+        "class": "Domain",
+        "properties": [
+            {"name": "domain", "dataType": ["text"], "sets": ["standard"]},
+            {"name": "employees", "dataType": ["int"], "sets": ["standard"]},
+            {"name": "notes", "dataType": ["text"], "sets": ["extended"]},
+            {"name": "partnerDomains", "dataType": ["text[]"], "sets": ["standard"]},
+        ],
+        "references": [
+            {
+                "name": "competitor",
+                "target_collection": "Research_competitor",
+                "uuid_source_field": "domain",
+            },
+            {
+                "name": "partners",
+                "target_collection": "Partner",
+                "uuid_source_field": "partnerDomains",
+            },
+        ],
+    },
+    "Research_competitor_schema.yaml": {
+        "id": "Research_competitor",
+        "group": "research",
+        "properties": [
+            {
+                "name": "summaryLLM",
+                "dataType": ["text"],
+                "sets": ["standard"],
+                "tags": ["LLM"],
+            },
+            {"name": "score", "dataType": ["int"], "sets": ["standard"]},
+        ],
+        "references": [
+            {
+                "name": "domainBeacon",
+                "target_collection": "Domain",
+                "uuid_source_field": "domain",
+            },
+            {
+                "name": "page",
+                "target_collection": "Page",
+                "uuid_source_field": "manual",
+            },
+        ],
+    },
+    "Partner_schema.yaml": {
+        "id": "Partner",
+        "properties": [{"name": "name", "dataType": ["text"], "sets": ["standard"]}],
+    },
+    "Page_schema.yaml": {
+        "id": "Page",
+        "properties": [{"name": "content", "dataType": ["text"], "sets": ["standard"]}],
+    },
+    "_TEMPLATE.yaml": {"id": "Domain", "properties": []},
+}
+
+AUTO = {
+    "collection": "Domain",
+    "relationship_traversal": True,
+    "dynamic_templates": True,
+    "traversal": {"max_depth": 2},
+}
+
+CARDS = {
+    "auto": {"display": True, "parameters": AUTO},
+    "shallow": {"parameters": {**AUTO, "traversal": {"max_depth": 1}}},
+    "skip_partners": {
+        "parameters": {
+            **AUTO,
+            "traversal": {"max_depth": 2, "policies": {"partners": "skip"}},
+        }
+    },
+    "explicit": {
+        "parameters": {**AUTO, "dynamic_templates": False},
+        "collections": [
+            {
+                "collection": "Domain",
+                "field_set": "standard",
+                "references": {"competitor": {"field_set": "standard"}},
+            }
+        ],
+    },
+    "explicit_fields": {
+        "parameters": {"collection": "Domain"},
+        "field_sets": {
+            "standard": {
+                "fields": [
+                    "domain",
+                    {"name": "domainAge", "source": "computed"},
+                    "missing",
+                ]
+            }
+        },
+    },
+}
+
+
+class TestDataCardCosts(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.schemas_dir = root / "schemas"
+        self.cards_dir = root / "data_cards"
+        self.output = root / "_compiled" / "executor_plans.json"
+        self.schemas_dir.mkdir()
+        self.cards_dir.mkdir()
+        for name, schema in SCHEMAS.items():
+            (self.schemas_dir / name).write_text(yaml.safe_dump(schema))
+        for card_id, card in CARDS.items():
+            card = {"id": card_id, "executor": "fetch", **card}
+            (self.cards_dir / f"{card_id}.yaml").write_text(yaml.safe_dump(card))
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _build(self) -> tuple[dict, int]:
+        return build_plans(
+            self.output, cards_dir=self.cards_dir, schemas_dir=self.schemas_dir
+        )
+
+    def _paths(self, plan: dict) -> list[tuple[str, int]]:
+        return [(node["path"], node["fanout"]) for node in plan["nodes"]]
+
+    def test_auto_discovers_references_without_revisiting(self) -> None:
+        plans, _ = self._build()
+        # competitor.domainBeacon points back at Domain and is not followed;
+        # partners and competitor.page are multi-valued (array / manual)
+        self.assertEqual(
+            self._paths(plans["auto"]),
+            [("Domain", 1), ("competitor", 1), ("competitor.page", 5), ("partners", 5)],
+        )
+        cost = plans["auto"]["cost"]
+        self.assertEqual(cost["reference_hops"], 2)
+        self.assertEqual(cost["fanout"], 11)
+        page_bytes = plans["auto"]["nodes"][2]["bytes_per_object"]
+        self.assertGreater(page_bytes, 4000)  # "content" is sized by name
+        self.assertEqual(
+            cost["bytes_per_object"],
+            sum(n["bytes_per_object"] * n["fanout"] for n in plans["auto"]["nodes"]),
+        )
+
+    def test_max_depth_and_skip_policies(self) -> None:
+        plans, _ = self._build()
+        self.assertEqual(
+            self._paths(plans["shallow"]),
+            [("Domain", 1), ("competitor", 1), ("partners", 5)],
+        )
+        self.assertNotIn(
+            "partners", [node["path"] for node in plans["skip_partners"]["nodes"]]
+        )
+
+    def test_explicit_references_replace_auto_discovery(self) -> None:
+        plans, _ = self._build()
+        self.assertEqual(
+            self._paths(plans["explicit"]), [("Domain", 1), ("competitor", 1)]
+        )
+
+    def test_explicit_fields_win_over_field_sets(self) -> None:
+        plans, _ = self._build()
+        plan = plans["explicit_fields"]
+        self.assertEqual(plan["nodes"][0]["properties"], ["domain"])
+        self.assertEqual(plan["warnings"], ["Domain.missing: not a schema property"])
+
+    def test_unchanged_rebuild_reuses_cached_plans(self) -> None:
+        self._build()
+        _, reused = self._build()
+        self.assertEqual(reused, len(CARDS))
+
+        # Touching a schema only invalidates the plans that read it
+        page = self.schemas_dir / "Page_schema.yaml"
+        page.write_text(page.read_text() + "description: changed\n")
+        _, reused = self._build()
+        self.assertEqual(reused, 3)
+
+    def test_adding_a_missing_schema_invalidates_the_plan(self) -> None:
+        card = {"id": "vendor", "parameters": {"collection": "Vendor"}}
+        (self.cards_dir / "vendor.yaml").write_text(yaml.safe_dump(card))
+        plans, _ = self._build()
+        self.assertEqual(plans["vendor"]["nodes"], [])
+        self.assertEqual(
+            plans["vendor"]["warnings"], ["schema not found for collection Vendor"]
+        )
+
+        (self.schemas_dir / "Vendor_schema.yaml").write_text(
+            yaml.safe_dump(SCHEMAS["Partner_schema.yaml"] | {"id": "Vendor"})
+        )
+        plans, reused = self._build()
+        self.assertEqual(reused, len(CARDS))
+        self.assertEqual(self._paths(plans["vendor"]), [("Vendor", 1)])
+        self.assertEqual(plans["vendor"]["warnings"], [])
+
+    def test_flags_only_user_facing_cards_over_budget(self) -> None:
+        plans, _ = self._build()
+        flagged = over_budget(plans, budget_mb=0.001)
+        self.assertEqual([plan["card_id"] for plan in flagged], ["auto"])
+        self.assertEqual(over_budget(plans, budget_mb=1000), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
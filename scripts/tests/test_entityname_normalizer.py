@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from entityname_normalizer import EntityNameNormalizer, batched  # noqa: E402
+from entityname_post_processor import clean_entity_name  # noqa: E402
+
+NAMES = [
+    ("Boomi | Connect everything to achieve anything.™", "boomi.com"),
+    ("Acme Corp - The Leading Provider", "acme.com"),
+    ("Company :: Welcome", "company.com"),
+    ("Home", "example.com"),
+    ("example.com", "EXAMPLE.com"),
+    ("", "example.com"),
+]
+
+
+class TestEntityNameNormalizer(unittest.TestCase):
+    def test_matches_clean_entity_name(self) -> None:
+        normalizer = EntityNameNormalizer()
+        for name, domain in NAMES * 2:
+            with self.subTest(name=name):
+                self.assertEqual(
+                    normalizer.normalize(name, domain), clean_entity_name(name, domain)
+                )
+
+    def test_repeated_names_hit_cache_and_share_one_string(self) -> None:
+        normalizer = EntityNameNormalizer()
+        prefix = "Boomi"  # built at runtime: equal to, but not, the literal below
+        first = normalizer.normalize(prefix + " | Integration", "boomi.com")
+        second = normalizer.normalize("Boomi | Integration", "BOOMI.com")
+        self.assertIs(first, second)
+        self.assertIs(first, normalizer.normalize("Boomi - iPaaS", "boomi.com"))
+        stats = normalizer.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+    def test_cache_is_bounded(self) -> None:
+        normalizer = EntityNameNormalizer(maxsize=2)
+        for name in ["A", "B", "C", "A"]:
+            normalizer.normalize(name)
+        stats = normalizer.stats()
+        self.assertEqual(stats["cache_size"], 2)
+        self.assertEqual(stats["evictions"], 2)
+
+    def test_streams_fact_batches(self) -> None:
+        facts = [
+            {"entity_name": "Boomi | Connect", "entity_name_normalized": ""},
+            {"entity_name": "Acme - Leading", "domain": "acme.com"},
+            {"entity_name": "acme.com", "domain": "acme.com"},
+            {"fact": "no entity"},
+        ]
+        normalizer = EntityNameNormalizer()
+        batches = normalizer.normalize_facts(batched(facts, 3), domain="boomi.com")
+        first = next(batches)
+        self.assertEqual(len(first), 3)
+        self.assertEqual(normalizer.stats()["facts"], 3)  # second batch not read yet
+        list(batches)
+        self.assertEqual(
+            [fact.get("entity_name_normalized") for fact in facts],
+            ["Boomi", "Acme", "", None],
+        )
+        self.assertEqual(normalizer.stats()["batches"], 2)
+
+    def test_cleans_llm_canonical_name(self) -> None:
+        facts = [
+            {
+                "entity_name": "The Prismatic Platform | Embedded iPaaS",
+                "entity_name_normalized": "Prismatic - Integrations",
+            },
+            {"entity_name": "Boomi Inc.", "entity_name_normalized": "Boomi"},
+            # Generic and domain-only names are blanked for re-extraction
+            {"entity_name": "Acme | Home", "entity_name_normalized": "Home"},
+            {"entity_name": "Prismatic", "entity_name_normalized": "prismatic.io"},
+        ]
+        normalizer = EntityNameNormalizer()
+        list(normalizer.normalize_facts([facts], domain="prismatic.io"))
+        self.assertEqual(
+            [fact["entity_name_normalized"] for fact in facts],
+            ["Prismatic", "Boomi", "", ""],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+import asyncio
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from instrumentation import Tracer  # noqa: E402
+
+
+class TestTracer(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.tracer = Tracer()
+        self.tracer.configure(self.dir / "trace.jsonl", self.dir / "chrome.json")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _by_name(self) -> dict[str, dict]:
+        return {record["name"]: record for record in self.tracer.spans}
+
+    def test_disabled_until_configured(self) -> None:
+        tracer = Tracer()
+        with tracer.span("work") as record:
+            tracer.count("files")
+        self.assertIsNone(record)
+        self.assertEqual((tracer.spans, tracer.counters), ([], {}))
+
+    def test_spans_nest(self) -> None:
+        with self.tracer.span("outer"), self.tracer.span("inner", file="a.yaml"):
+            pass
+        with self.tracer.span("sibling"):
+            pass
+        spans = self._by_name()
+        self.assertIsNone(spans["outer"]["parent"])
+        self.assertEqual(spans["inner"]["parent"], spans["outer"]["id"])
+        self.assertEqual(spans["inner"]["depth"], 1)
+        self.assertEqual(spans["inner"]["attrs"], {"file": "a.yaml"})
+        self.assertIsNone(spans["sibling"]["parent"])
+
+    def test_spans_nest_across_asyncio_tasks(self) -> None:
+        async def child(name: str) -> None:
+            with self.tracer.span(name):
+                await asyncio.sleep(0.01)
+                with self.tracer.span(f"{name}.leaf"):
+                    await asyncio.sleep(0)
+
+        async def run() -> None:
+            with self.tracer.span("root"):
+                await asyncio.gather(child("a"), child("b"))
+
+        asyncio.run(run())
+        spans = self._by_name()
+        for name in ("a", "b"):
+            self.assertEqual(spans[name]["parent"], spans["root"]["id"])
+            self.assertEqual(spans[f"{name}.leaf"]["parent"], spans[name]["id"])
+            self.assertEqual(spans[f"{name}.leaf"]["depth"], 2)
+
+    def test_counter_labels(self) -> None:
+        self.tracer.count("files_validated", dir="schemas")
+        self.tracer.count("files_validated", 2, dir="schemas")
+        self.tracer.count("errors", file="x.yaml", dir="tools")
+        self.tracer.count("total")
+        self.assertEqual(
+            self.tracer.counters,
+            {
+                "files_validated{dir=schemas}": 3,
+                "errors{dir=tools,file=x.yaml}": 1,
+                "total": 1,
+            },
+        )
+
+    def test_error_is_recorded_and_reraised(self) -> None:
+        with self.assertRaises(ValueError), self.tracer.span("fails"):
+            raise ValueError("boom")
+        self.assertEqual(self._by_name()["fails"]["error"], "ValueError")
+
+    def test_writes_jsonl_and_chrome_trace(self) -> None:
+        with self.tracer.span("outer"), self.tracer.span("inner"):
+            pass
+        self.tracer.count("files", dir="schemas")
+        self.tracer.finish()
+
+        records = [
+            json.loads(line)
+            for line in (self.dir / "trace.jsonl").read_text().splitlines()
+        ]
+        self.assertEqual(
+            [r["type"] for r in records], ["span", "span", "counter", "memory"]
+        )
+        self.assertEqual([r["name"] for r in records[:2]], ["outer", "inner"])
+        self.assertEqual(
+            records[2], {"type": "counter", "name": "files{dir=schemas}", "value": 1}
+        )
+        for record in records[:2]:
+            self.assertGreaterEqual(record["duration_ms"], 0)
+
+        chrome = json.loads((self.dir / "chrome.json").read_text())
+        events = chrome["traceEvents"]
+        self.assertEqual(sorted(e["ph"] for e in events), ["C", "X", "X"])
+        for event in events:
+            self.assertTrue({"name", "ph", "ts", "pid"} <= set(event))
+        spans = {e["name"]: e for e in events if e["ph"] == "X"}
+        self.assertLessEqual(spans["outer"]["ts"], spans["inner"]["ts"])
+        self.assertGreaterEqual(
+            spans["outer"]["ts"] + spans["outer"]["dur"],
+            spans["inner"]["ts"] + spans["inner"]["dur"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+import asyncio
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from verify_services import (  # noqa: E402
+    CACHED,
+    DEADLINE,
+    FAILED,
+    PASSED,
+    TIMEOUT,
+    SuccessCache,
+    resolve_profile_services,
+    verify_services,
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path == "/slow":
+            time.sleep(2)
+        status = 503 if self.path == "/down" else 200
+        self.send_response(status)
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def curl_check(url: str) -> dict:
+    return {
+        "verification": {
+            "command": f"curl -s -o /dev/null -w '%{{http_code}}' {url}",
+            "expected": "200",
+        }
+    }
+
+
+@unittest.skipUnless(shutil.which("curl"), "curl not installed")
+class TestVerifyServices(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.server.daemon_threads = True
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def run_checks(self, services: dict, **kwargs) -> dict:
+        kwargs.setdefault("timeout", 1.0)
+        kwargs.setdefault("deadline", 5.0)
+        results = asyncio.run(verify_services(services, **kwargs))
+        return {r.service: r for r in results}
+
+    def test_reports_pass_fail_and_timeout(self) -> None:
+        results = self.run_checks(
+            {
+                "up": curl_check(f"{self.base}/ok"),
+                "down": curl_check(f"{self.base}/down"),
+                "slow": curl_check(f"{self.base}/slow"),
+                "exit_code": {"verification": {"command": "true"}},
+            }
+        )
+        self.assertEqual(results["up"].status, PASSED)
+        self.assertEqual(results["down"].status, FAILED)
+        self.assertEqual(results["down"].output, "503")
+        self.assertEqual(results["slow"].status, TIMEOUT)
+        self.assertEqual(results["exit_code"].status, PASSED)
+
+    def test_runs_concurrently(self) -> None:
+        services = {f"slow_{i}": curl_check(f"{self.base}/slow") for i in range(5)}
+        start = time.perf_counter()
+        results = self.run_checks(services, timeout=3.0)
+        self.assertLess(time.perf_counter() - start, 4.0)
+        self.assertTrue(all(r.status == PASSED for r in results.values()))
+
+    def test_global_deadline_cancels_pending(self) -> None:
+        results = self.run_checks(
+            {
+                "up": curl_check(f"{self.base}/ok"),
+                "slow": curl_check(f"{self.base}/slow"),
+            },
+            timeout=5.0,
+            deadline=0.5,
+        )
+        self.assertEqual(results["up"].status, PASSED)
+        self.assertEqual(results["slow"].status, DEADLINE)
+
+    def test_retries_follow_first_attempt(self) -> None:
+        results = self.run_checks(
+            {
+                "down": curl_check(f"{self.base}/down"),
+                "up": curl_check(f"{self.base}/ok"),
+            },
+            retries=2,
+        )
+        self.assertEqual(results["down"].attempts, 3)
+        self.assertEqual(results["up"].attempts, 1)
+
+    def test_cache_skips_recent_successes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cache.json"
+            services = {
+                "up": curl_check(f"{self.base}/ok"),
+                "down": curl_check(f"{self.base}/down"),
+            }
+            self.run_checks(services, cache=SuccessCache(path, ttl=60))
+            results = self.run_checks(services, cache=SuccessCache(path, ttl=60))
+            self.assertEqual(results["up"].status, CACHED)
+            self.assertEqual(results["down"].status, FAILED)
+
+            results = self.run_checks(services, cache=SuccessCache(path, ttl=0))
+            self.assertEqual(results["up"].status, PASSED)
+
+
+class TestResolveProfileServices(unittest.TestCase):
+    def test_maps_container_names(self) -> None:
+        services = {
+            "spark_weaviate": {},
+            "spark_transformers": {},
+            "mac_redis": {"container": "mac-redis"},
+        }
+        runtime = {
+            "profiles": {
+                "data_pipeline": {
+                    "required_services": {
+                        "spark": [
+                            "spark-weaviate",
+                            "spark-transformers-1",
+                            "spark-transformers-2",
+                            "pomai-backend-spark",
+                        ],
+                        "mac": ["mac-redis"],
+                    }
+                }
+            }
+        }
+        matched, unmatched = resolve_profile_services(
+            "data_pipeline", runtime, services
+        )
+        self.assertEqual(matched, ["spark_weaviate", "spark_transformers", "mac_redis"])
+        self.assertEqual(unmatched, ["pomai-backend-spark"])
+
+
+if __name__ == "__main__":
+    unittest.main()
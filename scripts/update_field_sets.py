@@ -10,10 +10,16 @@ This script updates field set assignments according to the approved policy:
 
 Run from pom-config root:
     python scripts/update_field_sets.py
+    python scripts/update_field_sets.py --trace /tmp/field_sets.jsonl
 """
+
+import argparse
 from pathlib import Path
+
 import yaml
 
+from instrumentation import add_trace_arguments, configure_tracing, tracer
+
 
 # Use block style for lists, flow style for short values
 class CustomDumper(yaml.SafeDumper):
@@ -32,7 +38,7 @@ CustomDumper.add_representer(str, str_representer)
 def update_schema_field_sets(schema_path: Path) -> dict[str, list[str]]:
     """Update field sets in a single schema file."""
 
-    with open(schema_path) as f:
+    with tracer.span("yaml_load", file=schema_path.name), open(schema_path) as f:
         schema = yaml.safe_load(f)
 
     changes = {
@@ -92,7 +98,7 @@ def update_schema_field_sets(schema_path: Path) -> dict[str, list[str]]:
             changes["moved_to_extended"].append(name)
 
     # Write back
-    with open(schema_path, "w") as f:
+    with tracer.span("yaml_dump", file=schema_path.name), open(schema_path, "w") as f:
         yaml.dump(
             schema,
             f,
@@ -106,68 +112,83 @@ def update_schema_field_sets(schema_path: Path) -> dict[str, list[str]]:
 
 
 def main():
-    schema_dir = Path(__file__).parent.parent / "schemas"
-
-    print("📊 UPDATING FIELD SETS IN RESEARCH_* SCHEMAS")
-    print("=" * 70)
-    print()
-    print("Policy:")
-    print("  - Cat fields    → standard (classification)")
-    print("  - LLM fields    → standard (insights)")
-    print("  - Evidence      → extended (detailed citations)")
-    print("  - Research      → extended (supplementary data)")
-    print()
-
-    total_promoted = 0
-    total_moved = 0
-    total_correct = 0
-
-    for schema_file in sorted(schema_dir.glob("Research_*_schema.yaml")):
-        if "base" in schema_file.stem:
-            continue
-
-        researcher = schema_file.stem.replace("Research_", "").replace("_schema", "")
-        changes = update_schema_field_sets(schema_file)
-
-        promoted = len(changes["promoted_to_standard"])
-        moved = len(changes["moved_to_extended"])
-        correct = len(changes["already_correct"])
-
-        total_promoted += promoted
-        total_moved += moved
-        total_correct += correct
-
-        if promoted or moved:
-            print(f"📝 {researcher.upper()}")
-            if promoted:
-                print(
-                    f"   ⬆️  Promoted to standard: {', '.join(changes['promoted_to_standard'][:5])}"
-                )
-                if len(changes["promoted_to_standard"]) > 5:
+    parser = argparse.ArgumentParser(
+        description="Update field sets in Research_* schemas"
+    )
+    add_trace_arguments(parser)
+    configure_tracing(parser.parse_args())
+    try:
+        schema_dir = Path(__file__).parent.parent / "schemas"
+
+        print("📊 UPDATING FIELD SETS IN RESEARCH_* SCHEMAS")
+        print("=" * 70)
+        print()
+        print("Policy:")
+        print("  - Cat fields    → standard (classification)")
+        print("  - LLM fields    → standard (insights)")
+        print("  - Evidence      → extended (detailed citations)")
+        print("  - Research      → extended (supplementary data)")
+        print()
+
+        total_promoted = 0
+        total_moved = 0
+        total_correct = 0
+
+        for schema_file in sorted(schema_dir.glob("Research_*_schema.yaml")):
+            if "base" in schema_file.stem:
+                continue
+
+            researcher = schema_file.stem.replace("Research_", "").replace(
+                "_schema", ""
+            )
+            with tracer.span("update_schema", file=schema_file.name):
+                changes = update_schema_field_sets(schema_file)
+
+            promoted = len(changes["promoted_to_standard"])
+            moved = len(changes["moved_to_extended"])
+            correct = len(changes["already_correct"])
+
+            total_promoted += promoted
+            total_moved += moved
+            total_correct += correct
+            tracer.count("fields_changed", promoted + moved, file=schema_file.name)
+
+            if promoted or moved:
+                print(f"📝 {researcher.upper()}")
+                if promoted:
                     print(
-                        f"      ... and {len(changes['promoted_to_standard']) - 5} more"
+                        f"   ⬆️  Promoted to standard: {', '.join(changes['promoted_to_standard'][:5])}"
                     )
-            if moved:
-                print(
-                    f"   ⬇️  Moved to extended: {', '.join(changes['moved_to_extended'][:5])}"
-                )
-                if len(changes["moved_to_extended"]) > 5:
-                    print(f"      ... and {len(changes['moved_to_extended']) - 5} more")
-            print()
-
-    print("=" * 70)
-    print("✅ SUMMARY:")
-    print(f"   ⬆️  Promoted to standard: {total_promoted} fields")
-    print(f"   ⬇️  Moved to extended: {total_moved} fields")
-    print(f"   ✓  Already correct: {total_correct} fields")
-    print()
-    print("Next steps:")
-    print("  1. Review changes: git diff schemas/")
-    print(
-        "  2. Commit: git add -A && git commit -m 'feat: update field sets - LLM to standard'"
-    )
-    print("  3. Tag: git tag v1.6.0")
-    print("  4. Push: git push && git push --tags")
+                    if len(changes["promoted_to_standard"]) > 5:
+                        print(
+                            f"      ... and {len(changes['promoted_to_standard']) - 5} more"
+                        )
+                if moved:
+                    print(
+                        f"   ⬇️  Moved to extended: {', '.join(changes['moved_to_extended'][:5])}"
+                    )
+                    if len(changes["moved_to_extended"]) > 5:
+                        print(
+                            f"      ... and {len(changes['moved_to_extended']) - 5} more"
+                        )
+                print()
+
+        print("=" * 70)
+        print("✅ SUMMARY:")
+        print(f"   ⬆️  Promoted to standard: {total_promoted} fields")
+        print(f"   ⬇️  Moved to extended: {total_moved} fields")
+        print(f"   ✓  Already correct: {total_correct} fields")
+        print()
+        print("Next steps:")
+        print("  1. Review changes: git diff schemas/")
+        print(
+            "  2. Commit: git add -A && git commit -m 'feat: update field sets - LLM to standard'"
+        )
+        print("  3. Tag: git tag v1.6.0")
+        print("  4. Push: git push && git push --tags")
+
+    finally:
+        tracer.finish()
 
 
 if __name__ == "__main__":
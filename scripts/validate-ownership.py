@@ -7,12 +7,19 @@ Checks:
 2. No conflicting ownership claims
 3. All agents have required fields
 4. Cross-repo consistency
+
+Usage:
+    python scripts/validate-ownership.py [--trace FILE] [--chrome-trace FILE]
 """
 
+import argparse
 import sys
 from pathlib import Path
+
 import yaml
 
+from instrumentation import add_trace_arguments, configure_tracing, tracer
+
 
 def load_ownership(path: Path) -> dict:
     """Load and parse OWNERSHIP.yaml"""
@@ -20,7 +27,7 @@ def load_ownership(path: Path) -> dict:
         print(f"❌ Not found: {path}")
         return None
 
-    with open(path) as f:
+    with tracer.span("yaml_load", file=str(path)), open(path) as f:
         return yaml.safe_load(f)
 
 
@@ -38,6 +45,7 @@ def validate_agent(agent_name: str, agent_data: dict, repo_path: Path) -> list:
     for field in ["owns", "can_write"]:
         if field in agent_data:
             for path in agent_data[field]:
+                tracer.count("paths_checked", agent=agent_name)
                 full_path = repo_path / path.rstrip("/")
                 if not full_path.exists():
                     errors.append(
@@ -79,7 +87,8 @@ def validate_repo(name: str, ownership_path: Path, repo_path: Path) -> bool:
     # Validate each agent
     agents = ownership.get("ai_agents", {})
     for agent_name, agent_data in agents.items():
-        errors.extend(validate_agent(agent_name, agent_data, repo_path))
+        with tracer.span("validate_agent", agent=agent_name):
+            errors.extend(validate_agent(agent_name, agent_data, repo_path))
 
     # Check for conflicts
     errors.extend(find_conflicts(ownership))
@@ -97,28 +106,35 @@ def validate_repo(name: str, ownership_path: Path, repo_path: Path) -> bool:
 
 def main():
     """Main validation function"""
-    print("🔍 Validating OWNERSHIP.yaml files...")
-
-    # Find repos
-    home = Path.home() / "Projects"
-    repos = {
-        "pom-config": home / "pom-config",
-        "pom-docs": home / "pom-docs",
-    }
-
-    all_valid = True
-    for name, path in repos.items():
-        ownership_path = path / "OWNERSHIP.yaml"
-        if not validate_repo(name, ownership_path, path):
-            all_valid = False
-
-    print("\n" + "=" * 50)
-    if all_valid:
-        print("✅ All OWNERSHIP.yaml files are valid!")
-        return 0
-    else:
-        print("❌ Some issues found - please review above")
-        return 1
+    parser = argparse.ArgumentParser(description="Validate OWNERSHIP.yaml files")
+    add_trace_arguments(parser)
+    configure_tracing(parser.parse_args())
+    try:
+        print("🔍 Validating OWNERSHIP.yaml files...")
+
+        # Find repos
+        home = Path.home() / "Projects"
+        repos = {
+            "pom-config": home / "pom-config",
+            "pom-docs": home / "pom-docs",
+        }
+
+        all_valid = True
+        for name, path in repos.items():
+            ownership_path = path / "OWNERSHIP.yaml"
+            with tracer.span("validate_repo", repo=name):
+                if not validate_repo(name, ownership_path, path):
+                    all_valid = False
+
+        print("\n" + "=" * 50)
+        if all_valid:
+            print("✅ All OWNERSHIP.yaml files are valid!")
+            return 0
+        else:
+            print("❌ Some issues found - please review above")
+            return 1
+    finally:
+        tracer.finish()
 
 
 if __name__ == "__main__":
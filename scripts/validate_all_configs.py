@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 """Validate all pom-config YAML files against pom-core Pydantic models."""
 
+import argparse
 import os
 import sys
 from pathlib import Path
 
 import yaml
 
+from instrumentation import add_trace_arguments, configure_tracing, tracer
+from prompt_files import PROMPTS_DIR, extract_frontmatter, has_archived_parent
+
 # Set required env vars so pom_core imports without error (validation only,
 # no real connections are made).
 os.environ.setdefault("WEAVIATE_URL", "http://localhost:8080")
@@ -51,63 +55,59 @@ def validate_directory(
             continue  # Skip templates
 
         try:
-            with open(yaml_file) as f:
-                data = yaml.safe_load(f)
-
-            if data and (type_value is None or data.get("type") == type_value):
-                model_class.model_validate(data)
-                print(f"  ✓ {yaml_file.name}")
+            with tracer.span("validate_file", file=yaml_file.name):
+                with (
+                    tracer.span("yaml_load", file=yaml_file.name),
+                    open(yaml_file) as f,
+                ):
+                    data = yaml.safe_load(f)
+
+                if data and (type_value is None or data.get("type") == type_value):
+                    with tracer.span("model_validate", model=model_class.__name__):
+                        model_class.model_validate(data)
+                    tracer.count("files_validated", dir=dir_name)
+                    print(f"  ✓ {yaml_file.name}")
         except Exception as e:
+            tracer.count("validation_errors", dir=dir_name)
             errors.append(f"{yaml_file.name}: {e}")
             print(f"  ✗ {yaml_file.name}: {e}")
 
     return errors
 
 
-def _has_archived_parent(path: Path) -> bool:
-    """Return True if any parent directory starts with '_'."""
-    return any(part.startswith("_") for part in path.parts)
-
-
-def _extract_frontmatter(content: str) -> dict | None:
-    """Extract YAML frontmatter from prompty content."""
-    if not content.startswith("---"):
-        return None
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return None
-    yaml_content = parts[1]
-    return yaml.safe_load(yaml_content) if yaml_content else None
-
-
 def validate_prompts() -> list[str]:
     """Validate prompty files with pom-core PromptyTemplate."""
     errors = []
-    prompty_dir = CONFIG_ROOT / "prompts"
+    prompty_dir = PROMPTS_DIR
     if not prompty_dir.exists():
         return []
 
     prompty_service = CorePromptyService(base_path=str(prompty_dir))
 
     for prompty_file in prompty_dir.rglob("*.prompty"):
-        if prompty_file.name.startswith("_") or _has_archived_parent(prompty_file):
+        if prompty_file.name.startswith("_") or has_archived_parent(prompty_file):
             continue
 
         try:
-            content = prompty_file.read_text(encoding="utf-8")
-            template = prompty_service._parse_template(content, prompty_file.stem)
-            if template is None:
-                raise ValueError("PromptyTemplate parsing failed")
-
-            frontmatter = _extract_frontmatter(content) or {}
-            schema_ref = frontmatter.get("$schema")
-            if schema_ref:
-                schema_path = (prompty_file.parent / schema_ref).resolve()
-                if not schema_path.exists():
-                    raise FileNotFoundError(f"Schema reference not found: {schema_ref}")
-
+            with tracer.span("validate_prompt", file=prompty_file.name):
+                content = prompty_file.read_text(encoding="utf-8")
+                template = prompty_service._parse_template(content, prompty_file.stem)
+                if template is None:
+                    raise ValueError("PromptyTemplate parsing failed")
+
+                frontmatter = extract_frontmatter(content) or {}
+                schema_ref = frontmatter.get("$schema")
+                if schema_ref:
+                    schema_path = (prompty_file.parent / schema_ref).resolve()
+                    if not schema_path.exists():
+                        raise FileNotFoundError(
+                            f"Schema reference not found: {schema_ref}"
+                        )
+
+            tracer.count("files_validated", dir="prompts")
             print(f"  ✓ {prompty_file.name}")
         except Exception as e:
+            tracer.count("validation_errors", dir="prompts")
             errors.append(f"{prompty_file.name}: {e}")
             print(f"  ✗ {prompty_file.name}: {e}")
 
@@ -116,22 +116,32 @@ def validate_prompts() -> list[str]:
 
 def main():
     """Run validation on all config directories."""
-    all_errors = []
-
-    for dir_name, model_class, type_value in YAML_VALIDATORS:
-        print(f"\n📁 Validating {dir_name}/")
-        errors = validate_directory(dir_name, model_class, type_value)
-        all_errors.extend(errors)
-
-    print("\n📁 Validating prompts/")
-    all_errors.extend(validate_prompts())
-
-    if all_errors:
-        print(f"\n❌ {len(all_errors)} validation errors found")
-        sys.exit(1)
-    else:
-        print("\n✅ All configs validated successfully")
-        sys.exit(0)
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_trace_arguments(parser)
+    configure_tracing(parser.parse_args())
+    try:
+        all_errors = []
+
+        for dir_name, model_class, type_value in YAML_VALIDATORS:
+            print(f"\n📁 Validating {dir_name}/")
+            with tracer.span(
+                "validate_directory", dir=dir_name, model=model_class.__name__
+            ):
+                errors = validate_directory(dir_name, model_class, type_value)
+            all_errors.extend(errors)
+
+        print("\n📁 Validating prompts/")
+        with tracer.span("validate_directory", dir="prompts", model="PromptyTemplate"):
+            all_errors.extend(validate_prompts())
+
+        if all_errors:
+            print(f"\n❌ {len(all_errors)} validation errors found")
+            sys.exit(1)
+        else:
+            print("\n✅ All configs validated successfully")
+            sys.exit(0)
+    finally:
+        tracer.finish()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Verify services.yaml Services Concurrently
+
+Runs every `verification.command` declared in services.yaml at the same time,
+each under a per-service timeout and all under one global deadline, and
+compares the output with `expected` (or the exit code when no `expected` is
+declared). Timeouts, retries and the deadline default to the `validation`
+section of runtime.yaml.
+
+Checks are grouped by the workload profile's `required_services` so a slow
+optional endpoint never hides a failing required one. Recent successes are
+cached with a TTL, so back-to-back startups / profile switches skip checks
+that just passed.
+
+Usage:
+    # Verify everything, grouped by runtime.yaml's default profile
+    python scripts/verify_services.py
+
+    # Group by another workload profile (exit 1 if a required service fails)
+    python scripts/verify_services.py --profile ai
+
+    # Tighter budgets, no cache
+    python scripts/verify_services.py --timeout 3 --deadline 15 --no-cache
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import shutil
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import yaml
+
+from instrumentation import add_trace_arguments, configure_tracing, tracer
+
+CONFIG_ROOT = Path(__file__).parent.parent
+SERVICES_FILE = CONFIG_ROOT / "services.yaml"
+RUNTIME_FILE = CONFIG_ROOT / "runtime.yaml"
+CACHE_FILE = Path.home() / ".cache" / "pom-config" / "service-verification.json"
+
+DEFAULT_TTL = 300.0
+
+# Status values
+PASSED = "passed"
+FAILED = "failed"
+TIMEOUT = "timeout"
+DEADLINE = "deadline"
+CACHED = "cached"
+
+
+@dataclass
+class VerificationResult:
+    """Outcome of one service verification."""
+
+    service: str
+    status: str
+    latency: float = 0.0
+    attempts: int = 0
+    output: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (PASSED, CACHED)
+
+
+# ===================================================================
+# CONFIG LOADING
+# ===================================================================
+
+
+def load_yaml(path: Path) -> dict:
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
+
+
+def load_verifiable_services(services_config: dict) -> dict[str, dict]:
+    """Return services that declare a verification command, keyed by service id."""
+    return {
+        key: service
+        for key, service in (services_config.get("services") or {}).items()
+        if (service.get("verification") or {}).get("command")
+    }
+
+
+def _match_service(name: str, services: dict[str, dict]) -> str | None:
+    """
+    Map a runtime.yaml container name to a services.yaml key.
+
+    Tries an exact `container` match, then the underscored name
+    (spark-weaviate → spark_weaviate), then the replica base name
+    (spark-transformers-3 → spark_transformers).
+    """
+    for key, service in services.items():
+        if service.get("container") == name:
+            return key
+    candidates = [name.replace("-", "_"), re.sub(r"-\d+$", "", name).replace("-", "_")]
+    for candidate in candidates:
+        if candidate in services:
+            return candidate
+    return None
+
+
+def resolve_profile_services(
+    profile: str, runtime_config: dict, services: dict[str, dict]
+) -> tuple[list[str], list[str]]:
+    """
+    Resolve a profile's `required_services` to services.yaml keys.
+
+    Returns:
+        (matched service keys, container names without a declared verification)
+    """
+    profiles = runtime_config.get("profiles") or {}
+    if profile not in profiles:
+        raise KeyError(f"Unknown profile '{profile}' (valid: {', '.join(profiles)})")
+
+    matched: list[str] = []
+    unmatched: list[str] = []
+    for names in (profiles[profile].get("required_services") or {}).values():
+        for name in names:
+            key = _match_service(name, services)
+            if key is None:
+                unmatched.append(name)
+            elif key not in matched:
+                matched.append(key)
+    return matched, unmatched
+
+
+# ===================================================================
+# SUCCESS CACHE
+# ===================================================================
+
+
+class SuccessCache:
+    """JSON file of recent verification successes, expired after `ttl` seconds."""
+
+    def __init__(self, path: Path, ttl: float = DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.entries: dict[str, dict] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+                self.entries = data.get("successes", {})
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def is_fresh(self, service: str, spec: dict) -> bool:
+        entry = self.entries.get(service)
+        if not entry or entry.get("command") != spec["verification"]["command"]:
+            return False
+        return time.time() - entry.get("checked_at", 0) < self.ttl
+
+    def record(self, result: VerificationResult, spec: dict) -> None:
+        if result.status == PASSED:
+            self.entries[result.service] = {
+                "checked_at": time.time(),
+                "latency": result.latency,
+                "command": spec["verification"]["command"],
+            }
+        else:
+            self.entries.pop(result.service, None)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({"successes": self.entries}, indent=2))
+
+
+# ===================================================================
+# RUNNER
+# ===================================================================
+
+
+async def _run_command(command: str, timeout: float) -> tuple[int, str]:
+    process = await asyncio.create_subprocess_shell(
+        command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        # services.yaml commands use bash parameter expansion (see gcs)
+        executable=shutil.which("bash"),
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except BaseException:
+        # Timeout or deadline cancellation - don't leave curl running
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    return process.returncode, stdout.decode(errors="replace").strip()
+
+
+async def run_verification(
+    service: str, spec: dict, timeout: float, retries: int = 0
+) -> VerificationResult:
+    """Run one service's verification command, retrying failures up to `retries` times."""
+    command = spec["verification"]["command"]
+    expected = spec["verification"].get("expected")
+    result = VerificationResult(service=service, status=FAILED)
+    start = time.perf_counter()
+
+    # One attempt plus `retries` retries, like runtime.yaml health_check_retries
+    for attempt in range(1, max(retries, 0) + 2):
+        result.attempts = attempt
+        try:
+            with tracer.span("verify_service", service=service, attempt=attempt):
+                returncode, output = await _run_command(command, timeout)
+        except TimeoutError:
+            result.status, result.output = TIMEOUT, f"no response in {timeout:g}s"
+            continue
+        result.output = output or f"exit code {returncode}"
+        if expected is not None:
+            passed = output == str(expected)
+        else:
+            passed = returncode == 0
+        if passed:
+            result.status = PASSED
+            break
+        result.status = FAILED
+
+    result.latency = time.perf_counter() - start
+    return result
+
+
+async def verify_services(
+    services: dict[str, dict],
+    timeout: float,
+    deadline: float,
+    retries: int = 0,
+    cache: SuccessCache | None = None,
+) -> list[VerificationResult]:
+    """
+    Verify all `services` concurrently.
+
+    Services still running when `deadline` expires are cancelled and reported
+    with status "deadline". Results come back in the order of `services`.
+    """
+    results: dict[str, VerificationResult] = {}
+    tasks: dict[asyncio.Task, str] = {}
+
+    for service, spec in services.items():
+        if cache is not None and cache.is_fresh(service, spec):
+            results[service] = VerificationResult(
+                service=service,
+                status=CACHED,
+                latency=cache.entries[service].get("latency", 0.0),
+            )
+            continue
+        task = asyncio.create_task(run_verification(service, spec, timeout, retries))
+        tasks[task] = service
+
+    if tasks:
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            results[tasks[task]] = task.result()
+        for task in pending:
+            results[tasks[task]] = VerificationResult(
+                service=tasks[task],
+                status=DEADLINE,
+                latency=deadline,
+                output=f"global deadline of {deadline:g}s reached",
+            )
+
+    if cache is not None:
+        for service, result in results.items():
+            if result.status != CACHED:
+                cache.record(result, services[service])
+        cache.save()
+
+    return [results[service] for service in services]
+
+
+# ===================================================================
+# REPORTING
+# ===================================================================
+
+STATUS_ICONS = {
+    PASSED: "✅",
+    CACHED: "💾",
+    FAILED: "❌",
+    TIMEOUT: "⏱️ ",
+    DEADLINE: "⛔",
+}
+
+
+def print_latency_table(groups: dict[str, list[VerificationResult]]) -> None:
+    """Print one latency table per group, slowest first."""
+    for group, results in groups.items():
+        if not results:
+            continue
+        print(f"\n📋 {group.upper()} ({len(results)} services)")
+        print("-" * 70)
+        print(f"   {'Service':<28} {'Status':<10} {'Latency':>9} {'Tries':>6}")
+        for result in sorted(results, key=lambda r: r.latency, reverse=True):
+            icon = STATUS_ICONS.get(result.status, "  ")
+            print(
+                f"{icon} {result.service:<28} {result.status:<10} "
+                f"{result.latency * 1000:>7.0f}ms {result.attempts:>6}"
+            )
+            if not result.ok and result.output:
+                print(f"      ↳ {result.output[:80]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--profile", help="Workload profile (default: runtime.yaml defaults.profile)"
+    )
+    parser.add_argument("--services-file", type=Path, default=SERVICES_FILE)
+    parser.add_argument("--runtime-file", type=Path, default=RUNTIME_FILE)
+    parser.add_argument("--timeout", type=float, help="Per-service timeout (s)")
+    parser.add_argument("--deadline", type=float, help="Global deadline (s)")
+    parser.add_argument(
+        "--retries", type=int, help="Retries after a failed check (0 = one attempt)"
+    )
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL, help="Cache TTL (s)")
+    parser.add_argument("--cache", type=Path, default=CACHE_FILE)
+    parser.add_argument("--no-cache", action="store_true")
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    configure_tracing(args)
+    try:
+        runtime_config = load_yaml(args.runtime_file)
+        validation = runtime_config.get("validation") or {}
+        timeout = args.timeout
+        if timeout is None:
+            timeout = validation.get("health_check_timeout", 10)
+        deadline = args.deadline
+        if deadline is None:
+            deadline = validation.get("startup_timeout", 120)
+        retries = args.retries
+        if retries is None:
+            retries = validation.get("health_check_retries", 0)
+
+        services = load_verifiable_services(load_yaml(args.services_file))
+
+        print("🔍 VERIFYING SERVICES")
+        print("=" * 70)
+        print(
+            f"   timeout {timeout:g}s/service, deadline {deadline:g}s, {retries} retries"
+        )
+
+        profile = args.profile or (runtime_config.get("defaults") or {}).get("profile")
+        required: list[str] = []
+        if profile:
+            required, unmatched = resolve_profile_services(
+                profile, runtime_config, services
+            )
+            print(f"   profile {profile}: {len(required)} required services")
+            for name in unmatched:
+                print(f"   ⚠️  {name}: no verification declared in services.yaml")
+
+        cache = None
+        if not args.no_cache:
+            cache = SuccessCache(args.cache, args.ttl)
+
+        start = time.perf_counter()
+        results = asyncio.run(
+            verify_services(services, timeout, deadline, retries=retries, cache=cache)
+        )
+        elapsed = time.perf_counter() - start
+
+        groups = {
+            "required": [r for r in results if r.service in required],
+            "other": [r for r in results if r.service not in required],
+        }
+        print_latency_table(groups)
+        for result in results:
+            tracer.count("services_verified", status=result.status)
+
+        failed_required = [r for r in groups["required"] if not r.ok]
+        failed_other = [r for r in groups["other"] if not r.ok]
+
+        print("\n" + "=" * 70)
+        print(f"⏱️  Wall time: {elapsed:.2f}s for {len(results)} services")
+        if failed_other:
+            print(f"⚠️  {len(failed_other)} other service(s) unavailable")
+        if failed_required:
+            print(f"❌ {len(failed_required)} required service(s) failed")
+            return 1
+        print("✅ All required services verified")
+        return 0
+    finally:
+        tracer.finish()
+
+
+if __name__ == "__main__":
+    sys.exit(main())